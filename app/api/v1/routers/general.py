@@ -1,6 +1,7 @@
+import re
 import uuid
-from fastapi import APIRouter, HTTPException, Request, Query
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, field_validator
 from sqlmodel import SQLModel
 
 from app.dependencies import (
@@ -16,6 +17,10 @@ from app.repositories.email_account import EmailAccountRepository
 
 router = APIRouter()
 
+# Syntax-only email check, compiled once (EmailStr runs the full email_validator
+# parser on every request).
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
 
 @router.get("/")
 def root():
@@ -23,7 +28,14 @@ def root():
 
 
 class RegistrationRequest(SQLModel):
-    email: EmailStr
+    email: str
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        if not EMAIL_RE.match(value):
+            raise ValueError("value is not a valid email address")
+        return value
 
 
 @router.post("/auth/register")
@@ -54,7 +66,7 @@ def get_email_accounts(
     """
     try:
         # TODO: Extract user_id from JWT token in Authorization header
-        email_accounts = email_account_repository.find_by_user_id(
+        email_accounts = email_account_repository.find_by_user_id_list(
             user_id=HARDCODED_USER_ID
         )
         return email_accounts
@@ -64,12 +76,9 @@ def get_email_accounts(
 
 @router.post("/email-accounts/{email_account_id}/sync", response_model=WorkflowJob)
 def sync_email_account(
-    email_account_id: str,
+    email_account_id: uuid.UUID,
     email_account_service: EmailAccountServiceDep,
     job_service: JobServiceDep,
-    idempotency_key: str | None = Query(
-        None, description="Optional idempotency key to prevent duplicate sync jobs"
-    ),
 ):
     """
     Sync emails for an email account.
@@ -79,17 +88,14 @@ def sync_email_account(
     3) Checks if credentials are valid (refresh token not expired)
        - If expired, returns error suggesting re-authentication
     4) Begins ingestion job using strategy pattern based on provider
-    5) Returns job status with task_id and idempotency
+    5) Returns the active job (repeat requests get the same job back)
 
     Args:
         email_account_id: UUID of the EmailAccount to sync
-        idempotency_key: Optional key to prevent duplicate job submissions
     Returns:
-        SyncJobResponse with task_id, status, and idempotency_key
+        The active WorkflowJob for this email account
     """
     try:
-        email_account_uuid = uuid.UUID(email_account_id)
-
         active_job, created = job_service.get_or_create_active_job(
             resource_type=ResourceType.EMAIL_ACCOUNT,
             resource_id=email_account_id,
@@ -99,8 +105,7 @@ def sync_email_account(
         if created or active_job.status == JobStatus.QUEUED:
             job_status = email_account_service.start_email_account_sync(
                 active_job.id,
-                email_account_id=email_account_uuid,
-                idempotency_key=idempotency_key,
+                email_account_id=email_account_id,
             )
 
         return active_job
@@ -117,32 +122,57 @@ def sync_email_account(
 class JobStatusResponse(SQLModel):
     """Response model for job status check."""
 
-    task_id: str
+    job_id: uuid.UUID
     status: str
-    result: dict | None = None
+    phase: str | None = None
+    progress_current: int = 0
+    progress_total: int = 0
     error: str | None = None
 
 
-@router.get("/sync-jobs/{task_id}/status", response_model=JobStatusResponse)
-def get_sync_job_status(task_id: str, email_account_service: EmailAccountServiceDep):
+@router.get("/sync-jobs/{job_id}/status", response_model=JobStatusResponse)
+def get_sync_job_status(job_id: uuid.UUID, job_service: JobServiceDep):
     """
     Get the status of a sync job.
 
     Args:
-        task_id: Celery task ID returned from sync endpoint
+        job_id: ID of the WorkflowJob returned from sync endpoint
 
     Returns:
         JobStatusResponse with current job status
     """
     try:
-        status = email_account_service.get_sync_job_status(task_id)
-        return JobStatusResponse(
-            task_id=status["task_id"],
-            status=status["status"],
-            result=status.get("result"),
-            error=status.get("error"),
-        )
+        status = job_service.get_job_status(job_id)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get job status: {str(e)}"
         )
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatusResponse(**status)
+
+
+class JobStatusesRequest(SQLModel):
+    """Request model for bulk job status check."""
+
+    job_ids: list[uuid.UUID]
+
+
+@router.post("/sync-jobs/status", response_model=list[JobStatusResponse])
+def get_sync_job_statuses(req: JobStatusesRequest, job_service: JobServiceDep):
+    """
+    Get the status of many sync jobs at once.
+
+    Args:
+        req: IDs of the WorkflowJobs returned from sync endpoint
+
+    Returns:
+        List of JobStatusResponse, in request order; unknown IDs are omitted
+    """
+    try:
+        statuses = job_service.get_job_statuses(req.job_ids)
+        return [JobStatusResponse(**status) for status in statuses]
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get job statuses: {str(e)}"
+        )
@@ -1,12 +1,13 @@
-import secrets
 import uuid
 from fastapi import APIRouter, Request, Response, HTTPException
 from fastapi.responses import RedirectResponse
 import httpx
-from app.config import settings
-from app.dependencies import GoogleOAuthServiceDep
+from app.config import get_settings
+from app.dependencies import GoogleOAuthServiceDep, RedisDep
 from app.enums import EmailProvider, HARDCODED_USER_ID
+from app.logging import get_logger
 from app.services.google_oauth_helper import GoogleOAuthHelper
+from app.utils.token import token_urlsafe
 
 
 # TODO: Replace this hardcoded user_id with JWT token extraction from request headers
@@ -17,23 +18,38 @@ from app.services.google_oauth_helper import GoogleOAuthHelper
 
 
 router = APIRouter(prefix="/auth/google")
+settings = get_settings()
+logger = get_logger(__name__)
+
+# OAuth state is single-use and only valid for the duration of the consent screen.
+OAUTH_STATE_TTL_SECONDS = 600
+
+
+def _oauth_state_key(state: str) -> str:
+    return f"oauth_state:{state}"
 
 
 @router.get("/login/", tags=["login"], response_class=RedirectResponse)
-def google_auth_login():
+async def google_auth_login(redis: RedisDep):
     """Generate and return Google OAuth authorization URL."""
-    state = secrets.token_urlsafe(32)
+    state = token_urlsafe(32)
+    # Persist state so the consent callback can verify it (CSRF protection).
+    await redis.setex(
+        _oauth_state_key(state), OAUTH_STATE_TTL_SECONDS, str(HARDCODED_USER_ID)
+    )
     # Pure helper - can be instantiated directly (no DB access needed)
     helper = GoogleOAuthHelper()
     auth_url = helper.generate_auth_url(
         redirect_uri=settings.google_oauth_redirect_uri, state=state
     )
-    print("Google OAuth URL: ", auth_url)
+    logger.info("Google OAuth URL: %s", auth_url)
     return auth_url
 
 
 @router.get("/consent/", tags=["callback"])
-def google_consent_redirect(request: Request, oauth_service: GoogleOAuthServiceDep):
+async def google_consent_redirect(
+    request: Request, oauth_service: GoogleOAuthServiceDep, redis: RedisDep
+):
     """
     Handle Google OAuth callback and process authorization.
 
@@ -44,9 +60,15 @@ def google_consent_redirect(request: Request, oauth_service: GoogleOAuthServiceD
     # Parse and validate request parameters
     error = query_params.get("error")
     if error:
-        print("Error while attempting to get authorisation (Google): ", error)
+        logger.warning(
+            "Error while attempting to get authorisation (Google): %s", error
+        )
         return Response(status_code=403, content="User denied consent.")
 
+    state = query_params.get("state")
+    if not state or await redis.getdel(_oauth_state_key(state)) is None:
+        return Response(status_code=400, content="Invalid or expired OAuth state.")
+
     code = query_params.get("code")
     if not code:
         return Response(status_code=400, content="Authorization code not provided.")
@@ -57,25 +79,29 @@ def google_consent_redirect(request: Request, oauth_service: GoogleOAuthServiceD
         # For now, using hardcoded user_id. User must be registered first via /auth/register
         user_id = HARDCODED_USER_ID
 
-        user, email_account, google_auth_data = oauth_service.handle_oauth_callback(
-            code=code, redirect_uri=settings.google_oauth_redirect_uri, user_id=user_id
+        user, email_account, google_auth_data = (
+            await oauth_service.handle_oauth_callback(
+                code=code,
+                redirect_uri=settings.google_oauth_redirect_uri,
+                user_id=user_id,
+            )
         )
         # TODO: Move email ingestion to a dedicated endpoint
         # Render a UI here on FE with a success message then move user back to home screen.
         return RedirectResponse(url="http://localhost:8000/auth/google/success")
     except ValueError as e:
         # Scope validation error
-        print(f"OAuth validation error: {e}")
+        logger.warning("OAuth validation error: %s", e)
         return Response(status_code=400, content=str(e))
     except httpx.HTTPError as e:
         # HTTP errors from Google API calls
-        print(f"Error during OAuth flow: {e}")
+        logger.error("Error during OAuth flow: %s", e)
         return Response(
             status_code=500, content="Failed to complete OAuth flow with Google."
         )
     except Exception as e:
         # Unexpected errors
-        print(f"Unexpected error during OAuth flow: {e}")
+        logger.exception("Unexpected error during OAuth flow: %s", e)
         return Response(
             status_code=500,
             content="An unexpected error occurred during authentication.",
@@ -1,14 +1,30 @@
 from contextlib import contextmanager
+import orjson
+from sqlalchemy import event
 from sqlmodel import Session, create_engine
 
 from app.config import get_settings
+from app.db_utils import psycopg_url, raise_on_lazy_load
 
 settings = get_settings()
 
-db_engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+db_engine = create_engine(
+    psycopg_url(settings.database_url),
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    json_serializer=lambda o: orjson.dumps(o).decode(),
+    json_deserializer=orjson.loads,
+)
 
 
 @contextmanager
 def celery_session():
     with Session(db_engine) as session:
+        if settings.env in ("dev", "test"):
+            event.listen(session, "do_orm_execute", raise_on_lazy_load)
         yield session
+        session.commit()
@@ -4,6 +4,11 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    # "dev"/"test" enable stricter ORM guards (see app.db)
+    env: str = "production"
+    # Echo every SQL statement; local debugging only.
+    debug: bool = False
+
     # DB
     database_url: str
 
@@ -16,14 +21,15 @@ class Settings(BaseSettings):
     # Celery
     celery_broker_url: str
     celery_result_backend: str
+
+    # Redis (OAuth state, caches)
+    redis_url: str = "redis://localhost:6379/0"
     model_config = SettingsConfigDict(
-        env_file="/Users/raman/Documents/Development/Projects/notes-lab/.env"
+        env_file="/Users/raman/Documents/Development/Projects/notes-lab/.env",
+        frozen=True,
     )
 
 
-settings = Settings()  # TODO: Delete
-
-
 @lru_cache
 def get_settings():
     return Settings()
@@ -1,13 +1,23 @@
 from typing import Annotated
 from fastapi import Depends
+from sqlalchemy import event
 from sqlmodel import SQLModel, create_engine, Session
 
 from app.config import get_settings
+from app.db_utils import psycopg_url, raise_on_lazy_load
 
 settings = get_settings()
 
+
 engine = create_engine(
-    settings.database_url, echo=True, echo_pool=False, pool_pre_ping=True
+    psycopg_url(settings.database_url),
+    echo=settings.debug,
+    echo_pool=False,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=1800,
 )
 
 
@@ -19,7 +29,15 @@ def create_db_and_tables():
 
 def get_session():
     with Session(engine) as session:
+        if settings.env in ("dev", "test"):
+            # Surface accidental N+1 lazy loads loudly outside production.
+            event.listen(session, "do_orm_execute", raise_on_lazy_load)
+        # Unit of work: repositories only flush, the request commits once.
+        # An exception skips the commit and closing the session rolls back.
         yield session
+        session.commit()
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+# "function" scope runs the commit as soon as the handler returns, before the
+# response is sent, so a failed commit surfaces as an error to the client.
+SessionDep = Annotated[Session, Depends(get_session, scope="function")]
@@ -0,0 +1,23 @@
+"""Engine-free helpers shared by the API and Celery database modules."""
+
+from sqlalchemy.orm import ORMExecuteState, raiseload
+
+
+def psycopg_url(database_url: str) -> str:
+    """Route plain postgres URLs through the psycopg (v3) driver."""
+    for prefix in ("postgresql://", "postgres://"):
+        if database_url.startswith(prefix):
+            return "postgresql+psycopg://" + database_url[len(prefix) :]
+    return database_url
+
+
+def raise_on_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    """Make any relationship not explicitly eager-loaded raise instead of lazy loading."""
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
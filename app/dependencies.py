@@ -1,6 +1,11 @@
 import chunk
+from functools import cached_property
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
+import httpx
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from sqlmodel import Session
 from app.db import SessionDep
 from app.repositories.email_chunk import EmailChunkRepository
 from app.repositories.email_content_repository import EmailContentRepository
@@ -24,27 +29,116 @@ CHUNK_SIZE = 400
 OVERLAP = 50
 
 
+def get_redis(request: Request) -> Redis:
+    """Dependency to get the app-wide async Redis client."""
+    return request.app.state.redis
+
+
+def get_sync_redis(request: Request) -> SyncRedis:
+    """Dependency to get the app-wide blocking Redis client (for sync code)."""
+    return request.app.state.sync_redis
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency to get the app-wide pooled async HTTP client."""
+    return request.app.state.http_client
+
+
+class ServiceBundle:
+    """
+    Request-scoped container for the repositories and services used by routes.
+
+    Everything is built lazily on first access from the request's single
+    Session, so a route resolves one dependency instead of a chain of
+    repository -> service factories.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        http_client: httpx.AsyncClient,
+        sync_redis: SyncRedis | None = None,
+    ):
+        self.session = session
+        self.http_client = http_client
+        self.sync_redis = sync_redis
+
+    @cached_property
+    def user_repo(self) -> UserRepository:
+        return UserRepository(self.session)
+
+    @cached_property
+    def google_auth_repo(self) -> GoogleAuthDataRepository:
+        return GoogleAuthDataRepository(self.session)
+
+    @cached_property
+    def email_account_repo(self) -> EmailAccountRepository:
+        return EmailAccountRepository(self.session)
+
+    @cached_property
+    def job_repo(self) -> JobRepository:
+        return JobRepository(self.session)
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return UserService(self.user_repo)
+
+    @cached_property
+    def job_service(self) -> JobService:
+        return JobService(self.job_repo)
+
+    @cached_property
+    def email_account_service(self) -> EmailAccountService:
+        return EmailAccountService(
+            self.email_account_repo,
+            self.user_repo,
+            self.google_auth_repo,
+            redis=self.sync_redis,
+        )
+
+    @cached_property
+    def google_oauth_service(self) -> GoogleOAuthService:
+        return GoogleOAuthService(
+            self.user_repo,
+            self.google_auth_repo,
+            self.email_account_service,
+            self.http_client,
+        )
+
+
+def get_services(
+    session: SessionDep,
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+    sync_redis: Annotated[SyncRedis, Depends(get_sync_redis)],
+) -> ServiceBundle:
+    """Dependency to get the request's ServiceBundle."""
+    return ServiceBundle(session, http_client, sync_redis)
+
+
+ServicesDep = Annotated[ServiceBundle, Depends(get_services)]
+
+
 def get_email_repository(session: SessionDep) -> EmailRepository:
     return EmailRepository(session)
 
 
-def get_job_repository(session: SessionDep) -> JobRepository:
-    return JobRepository(session)
+def get_job_repository(services: ServicesDep) -> JobRepository:
+    return services.job_repo
 
 
-def get_user_repository(session: SessionDep) -> UserRepository:
+def get_user_repository(services: ServicesDep) -> UserRepository:
     """Dependency to get UserRepository instance."""
-    return UserRepository(session)
+    return services.user_repo
 
 
-def get_google_auth_repository(session: SessionDep) -> GoogleAuthDataRepository:
+def get_google_auth_repository(services: ServicesDep) -> GoogleAuthDataRepository:
     """Dependency to get GoogleAuthDataRepository instance."""
-    return GoogleAuthDataRepository(session)
+    return services.google_auth_repo
 
 
-def get_email_account_repository(session: SessionDep) -> EmailAccountRepository:
+def get_email_account_repository(services: ServicesDep) -> EmailAccountRepository:
     """Dependency to get EmailAccountRepository instance."""
-    return EmailAccountRepository(session)
+    return services.email_account_repo
 
 
 def get_email_content_repository(session: SessionDep) -> EmailContentRepository:
@@ -63,17 +157,13 @@ def get_email_chunk_service(
     return EmailChunkService(email_chunk_repo=email_chunk_repo)
 
 
-def get_user_service(
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
-) -> UserService:
+def get_user_service(services: ServicesDep) -> UserService:
     """Dependency to get UserService instance."""
-    return UserService(user_repo)
+    return services.user_service
 
 
-def get_job_service(
-    job_repo: Annotated[JobRepository, Depends(get_job_repository)],
-) -> JobService:
-    return JobService(job_repo)
+def get_job_service(services: ServicesDep) -> JobService:
+    return services.job_service
 
 
 def get_chunkifier() -> Chunkifier:
@@ -109,33 +199,19 @@ def get_email_ingestion_service(
     )
 
 
-def get_email_account_service(
-    email_account_repo: Annotated[
-        EmailAccountRepository, Depends(get_email_account_repository)
-    ],
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
-    google_auth_repo: Annotated[
-        GoogleAuthDataRepository, Depends(get_google_auth_repository)
-    ],
-) -> EmailAccountService:
+def get_email_account_service(services: ServicesDep) -> EmailAccountService:
     """Dependency to get EmailAccountService instance."""
-    return EmailAccountService(email_account_repo, user_repo, google_auth_repo)
+    return services.email_account_service
 
 
-def get_google_oauth_service(
-    user_repo: Annotated[UserRepository, Depends(get_user_repository)],
-    google_auth_repo: Annotated[
-        GoogleAuthDataRepository, Depends(get_google_auth_repository)
-    ],
-    email_account_service: Annotated[
-        EmailAccountService, Depends(get_email_account_service)
-    ],
-) -> GoogleOAuthService:
+def get_google_oauth_service(services: ServicesDep) -> GoogleOAuthService:
     """Dependency to get GoogleOAuthService instance."""
-    return GoogleOAuthService(user_repo, google_auth_repo, email_account_service)
+    return services.google_oauth_service
 
 
 # Type aliases for cleaner route signatures
+RedisDep = Annotated[Redis, Depends(get_redis)]
+HttpClientDep = Annotated[httpx.AsyncClient, Depends(get_http_client)]
 JobRepositoryDep = Annotated[JobRepository, Depends(get_job_repository)]
 UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
 GoogleAuthRepositoryDep = Annotated[
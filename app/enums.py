@@ -14,6 +14,11 @@ class JobStatus(str, Enum):
     FAILED = "FAILED"
 
 
+# Statuses of a job that still occupies its resource; mirrored by the
+# ix_workflow_job_active partial index predicate.
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
 class JobType(str, Enum):
     MAILBOX_SYNC = "MAILBOX_SYNC"
 
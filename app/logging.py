@@ -1,8 +1,29 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def setup_logging():
+    global _listener
+
+    # Both the API and the Celery app call this; configure the process once
+    # rather than opening another app.log handle per call.
+    if _listener is not None:
+        return
+
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
@@ -18,9 +39,19 @@ def setup_logging():
     file_handler = logging.FileHandler("app.log")
     file_handler.setFormatter(formatter)
 
+    # Callers only enqueue records; formatting and stream/file I/O happen on the
+    # listener's background thread so logging never blocks the event loop.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+
     logger.handlers.clear()
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(QueueHandler(log_queue))
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
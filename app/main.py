@@ -1,19 +1,46 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+import httpx
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
 
+from app.config import get_settings
 from app.db import create_db_and_tables
+from app.logging import setup_logging
 
 
 from app.api.v1.routers.general import router as GeneralRouter
 from app.api.v1.routers.google_auth import router as GoogleAuthRouter
 
+setup_logging()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    app.state.redis = Redis.from_url(get_settings().redis_url, decode_responses=True)
+    # For sync endpoints/services, which run in the threadpool.
+    app.state.sync_redis = SyncRedis.from_url(
+        get_settings().redis_url, decode_responses=True
+    )
+    # Shared across requests so outbound calls (e.g. Google OAuth) reuse pooled
+    # keep-alive connections instead of a TCP+TLS handshake per call.
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=50, keepalive_expiry=30
+        ),
+    )
     yield
+    await app.state.http_client.aclose()
+    await app.state.redis.aclose()
+    app.state.sync_redis.close()
 
 
-app = FastAPI(title="Order Scope", lifespan=lifespan)
+app = FastAPI(
+    title="Order Scope", lifespan=lifespan, default_response_class=ORJSONResponse
+)
 app.include_router(GeneralRouter)
 app.include_router(GoogleAuthRouter)
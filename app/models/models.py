@@ -1,31 +1,56 @@
+"""
+Table models.
+
+Relationships: none are declared yet (foreign keys are plain columns). Any
+Relationship added here must opt out of implicit lazy loading with
+`sa_relationship_kwargs={"lazy": "raise"}`, and repository methods that need
+the related rows load them explicitly, e.g.
+`select(User).options(selectinload(User.email_accounts), raiseload("*"))`.
+In dev/test, sessions also apply `raiseload("*")` to every ORM select
+(see app.db), so an accidental N+1 fails loudly instead of degrading silently.
+"""
+
 from typing import List
 import uuid
 from fastapi import status
-from sqlmodel import Boolean, Field, SQLModel, TIMESTAMP, UniqueConstraint
+from sqlmodel import Boolean, Field, Index, SQLModel, TIMESTAMP, UniqueConstraint, text
 from sqlmodel.main import EmailStr
-from datetime import timezone, datetime
+from datetime import datetime
 
 from app.enums import EmailProvider, JobPhase, JobStatus, JobType, ResourceType
 
+from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import JSONB
 
 
 class BaseModel(SQLModel):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
+    # Generated by Postgres (13+) so inserts fetch it via RETURNING instead of
+    # drawing a uuid4 per row in Python.
+    id: uuid.UUID | None = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"server_default": text("gen_random_uuid()")},
+    )
+    # Timestamps are stamped by Postgres as well; eager_defaults brings them
+    # back in the same INSERT/UPDATE ... RETURNING.
+    created_at: datetime | None = Field(
+        default=None,
         nullable=False,
+        sa_column_kwargs={"server_default": func.now()},
         sa_type=TIMESTAMP(timezone=True),
     )
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
+    updated_at: datetime | None = Field(
+        default=None,
         nullable=False,
         sa_column_kwargs={
-            "onupdate": lambda: datetime.now(timezone.utc),
+            "server_default": func.now(),
+            "onupdate": func.now(),
         },
         sa_type=TIMESTAMP(timezone=True),
     )
 
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class User(BaseModel, table=True):
     __tablename__ = "user"
@@ -38,6 +63,10 @@ class User(BaseModel, table=True):
 
 class EmailAccount(BaseModel, table=True):
     __tablename__ = "email_account"
+    __table_args__ = (
+        Index("ix_email_account_user_email", "user_id", "email"),
+        Index("ix_email_account_user_provider", "user_id", "provider"),
+    )
     user_id: uuid.UUID = Field(foreign_key="user.id")
     email: EmailStr = Field(unique=True)
     provider: EmailProvider
@@ -47,7 +76,7 @@ class GoogleAuthData(BaseModel, table=True):
     __tablename__ = "google_auth_data"
     # Denormalized for quick lookups; User is derivable via EmailAccount
     user_id: uuid.UUID | None = Field(
-        default=None, foreign_key="user.id", nullable=True
+        default=None, foreign_key="user.id", nullable=True, index=True
     )
 
     # Email Account ID
@@ -89,7 +118,31 @@ class EmailContent(BaseModel, table=True):
     # inline_images: List[InlineImageMeta]
 
 
+ACTIVE_JOB_PREDICATE = text("status IN ('QUEUED', 'RUNNING')")
+
+
 class WorkflowJob(BaseModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_workflow_job_resource",
+            "resource_id",
+            "resource_type",
+            "job_type",
+            "status",
+        ),
+        # Only queued/running jobs are ever looked up by resource, and they are
+        # a handful of rows next to the growing completed history. Unique: a
+        # resource has at most one active job per type, which also lets
+        # JobRepository.create_if_no_active use it as an ON CONFLICT target.
+        Index(
+            "ix_workflow_job_active",
+            "resource_id",
+            "resource_type",
+            "job_type",
+            unique=True,
+            postgresql_where=ACTIVE_JOB_PREDICATE,
+        ),
+    )
     celery_task_id: uuid.UUID | None
     job_type: JobType
     status: JobStatus
@@ -1,55 +1,102 @@
+from threading import RLock
+from typing import Iterator
+from cachetools import TTLCache
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import Session, select
 import uuid
-from app.models.models import EmailAccount
+from app.models.models import EmailAccount, GoogleAuthData
 from app.enums import EmailProvider
 
+# Rows fetched per round-trip when streaming multi-row results.
+YIELD_PER = 500
+
+# Built once at import; hot lookups only bind parameters per call.
+_STMT_EMAIL_ACCOUNT_BY_EMAIL = select(EmailAccount).where(
+    EmailAccount.email == bindparam("email")
+)
+
+# Process-wide snapshots of recently read accounts, keyed by id and by
+# (user_id, email). Accounts are effectively immutable once created, so a short
+# TTL absorbs bursts of lookups (e.g. repeated sync requests) without a query.
+_CACHE_TTL_SECONDS = 30
+_cache: TTLCache = TTLCache(maxsize=4096, ttl=_CACHE_TTL_SECONDS)
+_cache_lock = RLock()
+
+
+def _cache_put(email_account: EmailAccount) -> None:
+    snapshot = email_account.model_dump()
+    with _cache_lock:
+        _cache[email_account.id] = snapshot
+        _cache[(email_account.user_id, email_account.email)] = snapshot
+
+
+def _cache_evict(email_account: EmailAccount) -> None:
+    with _cache_lock:
+        snapshot = _cache.pop(email_account.id, None)
+        if snapshot is not None:
+            # The account may have been edited since it was cached.
+            _cache.pop((snapshot["user_id"], snapshot["email"]), None)
+        _cache.pop((email_account.user_id, email_account.email), None)
+
 
 class EmailAccountRepository:
     """Repository for EmailAccount model database operations."""
 
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
     def find_by_email(self, email: str) -> EmailAccount | None:
         """Find an EmailAccount by email address."""
-        return self.session.exec(
-            select(EmailAccount).where(EmailAccount.email == email)
-        ).first()
+        return self.session.scalars(
+            _STMT_EMAIL_ACCOUNT_BY_EMAIL, {"email": email}
+        ).one_or_none()
 
-    def find_by_user_id(self, user_id: uuid.UUID) -> list[EmailAccount]:
-        """Find all EmailAccounts for a user."""
-        return list(
-            self.session.exec(
-                select(EmailAccount).where(EmailAccount.user_id == user_id)
-            ).all()
+    def find_by_user_id(self, user_id: uuid.UUID) -> Iterator[EmailAccount]:
+        """Stream all EmailAccounts for a user, YIELD_PER rows at a time."""
+        yield from self.session.exec(
+            select(EmailAccount)
+            .where(EmailAccount.user_id == user_id)
+            .execution_options(yield_per=YIELD_PER)
         )
 
+    def find_by_user_id_list(self, user_id: uuid.UUID) -> list[EmailAccount]:
+        """Find all EmailAccounts for a user as a list."""
+        return list(self.find_by_user_id(user_id))
+
     def find_by_email_account_id(
         self, email_account_id: uuid.UUID
     ) -> EmailAccount | None:
-        stmt = select(EmailAccount).where(EmailAccount.id == email_account_id)
-        return self.session.exec(stmt).first()
+        return self.find_by_id(email_account_id)
 
     def find_by_user_and_email(
         self, user_id: uuid.UUID, email: str
     ) -> EmailAccount | None:
         """Find an EmailAccount by user_id and email."""
-        return self.session.exec(
+        cached = self._from_cache((user_id, email))
+        if cached is not None:
+            return cached
+        email_account = self.session.exec(
             select(EmailAccount).where(
                 EmailAccount.user_id == user_id, EmailAccount.email == email
             )
         ).first()
+        if email_account is not None:
+            _cache_put(email_account)
+        return email_account
 
     def find_by_user_and_provider(
         self, user_id: uuid.UUID, provider: EmailProvider
-    ) -> list[EmailAccount]:
-        """Find all EmailAccounts for a user with a specific provider."""
-        return list(
-            self.session.exec(
-                select(EmailAccount).where(
-                    EmailAccount.user_id == user_id, EmailAccount.provider == provider
-                )
-            ).all()
+    ) -> Iterator[EmailAccount]:
+        """Stream all EmailAccounts for a user with a specific provider."""
+        yield from self.session.exec(
+            select(EmailAccount)
+            .where(EmailAccount.user_id == user_id, EmailAccount.provider == provider)
+            .execution_options(yield_per=YIELD_PER)
         )
 
     def create(
@@ -65,17 +112,88 @@ class EmailAccountRepository:
             provider=provider,
         )
         self.session.add(email_account)
-        self.session.commit()
-        self.session.refresh(email_account)
+        self.session.flush([email_account])
+        return email_account
+
+    def create_if_not_exists(
+        self,
+        user_id: uuid.UUID,
+        email: str,
+        provider: EmailProvider,
+    ) -> EmailAccount | None:
+        """
+        Create a new EmailAccount in a single INSERT ... ON CONFLICT DO NOTHING.
+
+        Returns:
+            The created EmailAccount, or None if the email is already linked.
+        """
+        stmt = (
+            pg_insert(EmailAccount)
+            .values(user_id=user_id, email=email, provider=provider)
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(EmailAccount)
+        )
+        email_account = self.session.execute(stmt).scalar_one_or_none()
+        if email_account is not None:
+            # RETURNING already populated every column; detach so the request's
+            # commit doesn't expire it and force a reload SELECT on first access.
+            self.session.expunge(email_account)
         return email_account
 
     def update(self, email_account: EmailAccount) -> EmailAccount:
         """Update an existing EmailAccount."""
+        _cache_evict(email_account)
         self.session.add(email_account)
-        self.session.commit()
-        self.session.refresh(email_account)
+        self.session.flush([email_account])
         return email_account
 
     def find_by_id(self, email_account_id: uuid.UUID) -> EmailAccount | None:
         """Find an EmailAccount by ID."""
-        return self.session.get(EmailAccount, email_account_id)
+        cached = self._from_cache(email_account_id)
+        if cached is not None:
+            return cached
+        email_account = self.session.get(EmailAccount, email_account_id)
+        if email_account is not None:
+            _cache_put(email_account)
+        return email_account
+
+    def find_with_auth(
+        self, email_account_id: uuid.UUID
+    ) -> tuple[EmailAccount | None, GoogleAuthData | None]:
+        """
+        Load an EmailAccount and its GoogleAuthData in one LEFT JOIN.
+        Missing rows come back as None.
+        """
+        row = self.session.exec(
+            select(EmailAccount, GoogleAuthData)
+            .outerjoin(
+                GoogleAuthData, GoogleAuthData.email_account_id == EmailAccount.id
+            )
+            .where(EmailAccount.id == email_account_id)
+        ).first()
+        if row is None:
+            return None, None
+        email_account, google_auth_data = row
+        _cache_put(email_account)
+        return email_account, google_auth_data
+
+    def _from_cache(self, key) -> EmailAccount | None:
+        """
+        Return the cached account for `key` as a persistent instance of this
+        session (reusing one already in its identity map), or None on a miss.
+        """
+        with _cache_lock:
+            snapshot = _cache.get(key)
+        if snapshot is None:
+            return None
+        existing = self.session.identity_map.get(
+            identity_key(EmailAccount, snapshot["id"])
+        )
+        if existing is not None:
+            return existing
+        email_account = EmailAccount(**snapshot)
+        # Mark it as loaded from the database (no pending changes) and attach
+        # it, so it behaves exactly like a row this session just read.
+        make_transient_to_detached(email_account)
+        self.session.add(email_account)
+        return email_account
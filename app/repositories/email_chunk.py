@@ -6,6 +6,8 @@ from app.models.models import EmailChunk
 
 
 class EmailChunkRepository:
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -8,6 +8,8 @@ from app.models.models import EmailContent
 
 class EmailContentRepository:
 
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
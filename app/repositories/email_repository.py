@@ -8,6 +8,8 @@ from app.models.models import Email, EmailContent
 
 
 class EmailRepository:
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -1,22 +1,28 @@
-from sqlmodel import Session, select, or_
+from sqlalchemy import bindparam
+from sqlmodel import Session, select
 from app.models.models import GoogleAuthData
 import uuid
 from datetime import datetime
 
+# Built once at import; hot lookups only bind parameters per call.
+_STMT_BY_GOOGLE_USER_ID = select(GoogleAuthData).where(
+    GoogleAuthData.google_user_id == bindparam("google_user_id")
+)
+
 
 class GoogleAuthDataRepository:
     """Repository for GoogleAuthData model database operations."""
 
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
     def find_by_google_user_id(self, google_user_id: str) -> GoogleAuthData | None:
         """Find GoogleAuthData by Google user ID."""
-        return self.session.exec(
-            select(GoogleAuthData).where(
-                GoogleAuthData.google_user_id == google_user_id
-            )
-        ).first()
+        return self.session.scalars(
+            _STMT_BY_GOOGLE_USER_ID, {"google_user_id": google_user_id}
+        ).one_or_none()
 
     def find_by_email_account_id(
         self, email_account_id: uuid.UUID
@@ -38,16 +44,15 @@ class GoogleAuthDataRepository:
         self, user_id: uuid.UUID | None = None, google_user_id: str | None = None
     ) -> GoogleAuthData | None:
         """Find GoogleAuthData by either user_id or google_user_id."""
-        if not user_id and not google_user_id:
-            return None
-
-        conditions = []
-        if user_id:
-            conditions.append(GoogleAuthData.user_id == user_id)
+        # google_user_id is unique and known on every OAuth callback, so one
+        # probe of its unique index usually settles it; user_id is the fallback.
         if google_user_id:
-            conditions.append(GoogleAuthData.google_user_id == google_user_id)
-
-        return self.session.exec(select(GoogleAuthData).where(or_(*conditions))).first()
+            google_auth_data = self.find_by_google_user_id(google_user_id)
+            if google_auth_data or not user_id:
+                return google_auth_data
+        if user_id:
+            return self.find_by_user_id(user_id)
+        return None
 
     def create(
         self,
@@ -70,13 +75,11 @@ class GoogleAuthDataRepository:
             refresh_token_expires_at=refresh_token_expires_at,
         )
         self.session.add(google_auth_data)
-        self.session.commit()
-        self.session.refresh(google_auth_data)
+        self.session.flush([google_auth_data])
         return google_auth_data
 
     def update(self, google_auth_data: GoogleAuthData) -> GoogleAuthData:
         """Update an existing GoogleAuthData record."""
         self.session.add(google_auth_data)
-        self.session.commit()
-        self.session.refresh(google_auth_data)
+        self.session.flush([google_auth_data])
         return google_auth_data
@@ -1,11 +1,27 @@
-from sqlmodel import Session, select
-from app.models.models import WorkflowJob
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, insert, select, update
+from app.models.models import ACTIVE_JOB_PREDICATE, WorkflowJob
 from app.enums import JobStatus, ResourceType, JobType
-from typing import List
+from typing import List, Sequence
 import uuid
 
+# Progress pings have a fixed shape, so the statement is built once. Nothing is
+# returned and no in-session objects are synchronised.
+_STMT_UPDATE_PROGRESS = (
+    update(WorkflowJob)
+    .where(WorkflowJob.id == bindparam("job_id"))
+    .values(progress_current=bindparam("progress"))
+    .execution_options(synchronize_session=False)
+)
+
 
 class JobRepository:
+    # Unlike the request-scoped repositories, job writes commit immediately:
+    # Celery workers must see a job row as soon as it is enqueued, and the API
+    # polls progress written mid-task.
+
+    __slots__ = ("session",)
 
     def __init__(self, session: Session):
         self.session = session
@@ -15,7 +31,7 @@ class JobRepository:
         resource_id: uuid.UUID,
         resource_type: ResourceType,
         job_type: JobType,
-        statuses: List[JobStatus] | None = None,
+        statuses: Sequence[JobStatus] | None = None,
     ) -> WorkflowJob | None:
         """
         Find a job for a specific resource with optional status filtering.
@@ -36,7 +52,18 @@ class JobRepository:
         )
 
         if statuses:
-            statement = statement.where(WorkflowJob.status.in_(statuses))
+            # Rendered inline so the planner can match the status list against
+            # the ix_workflow_job_active predicate even under a generic plan.
+            statement = statement.where(
+                WorkflowJob.status.in_(
+                    bindparam(
+                        "statuses",
+                        list(statuses),
+                        expanding=True,
+                        literal_execute=True,
+                    )
+                )
+            )
 
         return self.session.exec(statement).first()
 
@@ -47,22 +74,102 @@ class JobRepository:
         job_type: JobType,
         job_status: JobStatus,
     ):
-        workflow_job = WorkflowJob(
-            resource_id=resource_id,
-            resource_type=resource_type,
-            job_type=job_type,
-            status=job_status,
-        )
-        self.session.add(workflow_job)
+        workflow_job = self.session.scalars(
+            insert(WorkflowJob)
+            .values(
+                WorkflowJob(
+                    resource_id=resource_id,
+                    resource_type=resource_type,
+                    job_type=job_type,
+                    status=job_status,
+                ).model_dump(exclude={"id", "created_at", "updated_at"})
+            )
+            .returning(WorkflowJob)
+        ).one()
+        # RETURNING already populated every column; detach so the commit doesn't
+        # expire it and force a reload SELECT on first access.
+        self.session.expunge(workflow_job)
+        self.session.commit()
+        return workflow_job
+
+    def create_if_no_active(
+        self,
+        resource_id: uuid.UUID,
+        resource_type: ResourceType,
+        job_type: JobType,
+        job_status: JobStatus,
+    ) -> WorkflowJob | None:
+        """
+        Create a job in one INSERT ... ON CONFLICT DO NOTHING against the
+        unique active-job index.
+
+        Returns:
+            The created WorkflowJob, or None if the resource already has an
+            active job of this type.
+        """
+        workflow_job = self.session.scalars(
+            pg_insert(WorkflowJob)
+            .values(
+                WorkflowJob(
+                    resource_id=resource_id,
+                    resource_type=resource_type,
+                    job_type=job_type,
+                    status=job_status,
+                ).model_dump(exclude={"id", "created_at", "updated_at"})
+            )
+            .on_conflict_do_nothing(
+                index_elements=["resource_id", "resource_type", "job_type"],
+                index_where=ACTIVE_JOB_PREDICATE,
+            )
+            .returning(WorkflowJob)
+        ).one_or_none()
+        if workflow_job is not None:
+            self.session.expunge(workflow_job)
         self.session.commit()
-        self.session.refresh(workflow_job)
         return workflow_job
 
     def update(self, job: WorkflowJob) -> WorkflowJob:
         self.session.add(job)
+        # eager_defaults fetches the new updated_at via UPDATE ... RETURNING.
+        self.session.flush([job])
+        self.session.expunge(job)
         self.session.commit()
-        self.session.refresh(job)
         return job
 
+    def update_progress(self, job_id: uuid.UUID, progress_current: int) -> None:
+        """Set a job's progress_current without loading or returning the row."""
+        self.session.execute(
+            _STMT_UPDATE_PROGRESS, {"job_id": job_id, "progress": progress_current}
+        )
+        self.session.commit()
+
+    def partial_update(self, job_id: uuid.UUID, **fields) -> WorkflowJob | None:
+        """
+        Set `fields` on a job with a single UPDATE ... RETURNING, without
+        loading it first.
+
+        Returns:
+            The updated WorkflowJob, or None if no job has that ID
+        """
+        if not fields:
+            return self.find_by_id(job_id)
+        workflow_job = self.session.scalars(
+            update(WorkflowJob)
+            .where(WorkflowJob.id == job_id)
+            .values(**fields)
+            .returning(WorkflowJob)
+        ).one_or_none()
+        if workflow_job is not None:
+            self.session.expunge(workflow_job)
+        self.session.commit()
+        return workflow_job
+
     def find_by_id(self, id: uuid.UUID) -> WorkflowJob | None:
         return self.session.get(WorkflowJob, id)
+
+    def find_by_ids(self, ids: Sequence[uuid.UUID]) -> List[WorkflowJob]:
+        if not ids:
+            return []
+        return list(
+            self.session.exec(select(WorkflowJob).where(WorkflowJob.id.in_(ids)))
+        )
@@ -1,17 +1,48 @@
-from sqlmodel import Session, select
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, and_, select
 import uuid
-from app.models.models import User
+from app.models.models import EmailAccount, GoogleAuthData, User
+
+# Built once at import; hot lookups only bind parameters per call.
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
 
 
 class UserRepository:
     """Repository for User model database operations."""
 
+    __slots__ = ("session",)
+
     def __init__(self, session: Session):
         self.session = session
 
     def find_by_email(self, email: str) -> User | None:
         """Find a user by email."""
-        return self.session.exec(select(User).where(User.email == email)).first()
+        return self.session.scalars(_STMT_USER_BY_EMAIL, {"email": email}).one_or_none()
+
+    def find_with_email_account_and_google_auth(
+        self, user_id: uuid.UUID, email: str
+    ) -> tuple[User | None, EmailAccount | None, GoogleAuthData | None]:
+        """
+        Load a user, their EmailAccount for `email` and its GoogleAuthData in
+        one query. Missing rows come back as None.
+        """
+        stmt = (
+            select(User, EmailAccount, GoogleAuthData)
+            .outerjoin(
+                EmailAccount,
+                and_(EmailAccount.user_id == User.id, EmailAccount.email == email),
+            )
+            .outerjoin(
+                GoogleAuthData, GoogleAuthData.email_account_id == EmailAccount.id
+            )
+            .where(User.id == user_id)
+        )
+        row = self.session.exec(stmt).first()
+        if row is None:
+            return None, None, None
+        user, email_account, google_auth_data = row
+        return user, email_account, google_auth_data
 
     def create(
         self,
@@ -28,15 +59,44 @@ class UserRepository:
             is_registered=is_registered,
         )
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        self.session.flush([user])
+        return user
+
+    def create_if_not_exists(
+        self,
+        email: str,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        is_registered: bool = True,
+    ) -> User | None:
+        """
+        Create a new user in a single INSERT ... ON CONFLICT DO NOTHING.
+
+        Returns:
+            The created User, or None if the email is already registered.
+        """
+        stmt = (
+            pg_insert(User)
+            .values(
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                is_registered=is_registered,
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User)
+        )
+        user = self.session.execute(stmt).scalar_one_or_none()
+        if user is not None:
+            # RETURNING already populated every column; detach so the request's
+            # commit doesn't expire it and force a reload SELECT on first access.
+            self.session.expunge(user)
         return user
 
     def update(self, user: User) -> User:
         """Update an existing user."""
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        self.session.flush([user])
         return user
 
     def find_by_id(self, user_id: uuid.UUID) -> User | None:
@@ -2,6 +2,7 @@ import asyncio
 import json
 import random
 from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
 import uuid
 
 
@@ -10,7 +11,13 @@ from aiolimiter import AsyncLimiter
 from sqlalchemy import Result
 from sqlmodel import Session, col, func, select
 
-from app.client.gmail import GmailClient
+from app.client.gmail import (
+    BATCH_URL,
+    MAX_BATCH_SIZE,
+    GmailClient,
+    _build_batch_body,
+    _parse_batch_response,
+)
 from app.db import engine
 from app.dependencies import get_chunk_preparation_service
 from app.enums import HARDCODED_USER_ID
@@ -39,10 +46,24 @@ HEADERS = {
 }
 
 RETRYABLE_STATUS = {403, 429, 500, 502, 503, 504}
+# Failed batch sub-responses worth retrying with a lone GET.
+RETRYABLE_SUBREQUEST_STATUS = {429, 500, 502, 503, 504}
 
 
 async def get_with_backoff(
     client: httpx.AsyncClient, url: str, *, max_retries: int = 8
+) -> httpx.Response:
+    return await request_with_backoff(client, "GET", url, max_retries=max_retries)
+
+
+async def request_with_backoff(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    headers: Dict[str, str] = HEADERS,
+    content: str | None = None,
+    max_retries: int = 8,
 ) -> httpx.Response:
     """
     Retries on Gmail rate limits / transient errors with exponential backoff + jitter.
@@ -50,7 +71,7 @@ async def get_with_backoff(
     last_exc = None
     for attempt in range(max_retries):
         try:
-            r = await client.get(url, headers=HEADERS)
+            r = await client.request(method, url, headers=headers, content=content)
             if r.status_code < 400:
                 return r
 
@@ -97,25 +118,78 @@ async def fetch_message_content(
 
 
 async def fetch_messages_by_ids(
+    client: httpx.AsyncClient,
     message_ids: List[str],
     *,
     user_id: str = MY_GOOGLE_USER_ID,
     concurrency: int = 20,  # max in-flight requests
-    rps: int = 50,  # max requests per second (tune)
+    rps: int = 50,  # max message fetches per second (tune)
 ) -> List[Dict[str, Any]]:
+    # The caller owns `client` so repeated batches reuse its warm connections.
+    # Gmail charges quota per message, batched or not, so the limiter counts
+    # messages: a batch takes one token per sub-request and is capped at `rps`
+    # so a single acquire can always be satisfied.
     sem = asyncio.Semaphore(concurrency)
     limiter = AsyncLimiter(rps, time_period=1)  # rps per 1 second window
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-
-        async def one(mid: str) -> Dict[str, Any]:
-            async with sem:
-                async with limiter:
-                    return await fetch_message_content(client, user_id, mid)
-
-        # gather schedules all coroutines; limiter+sem prevents flooding
-        coros = [one(mid) for mid in message_ids]
-        return await asyncio.gather(*coros)
+    path = urlsplit(BASE_URL).path
+    batch_size = min(MAX_BATCH_SIZE, rps)
+
+    async def one(mid: str) -> Dict[str, Any]:
+        async with sem:
+            async with limiter:
+                return await fetch_message_content(client, user_id, mid)
+
+    async def one_batch(batch_ids: List[str]) -> List[Dict[str, Any]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = _build_batch_body(
+            [f"{path}/users/{user_id}/messages/{mid}?format=full" for mid in batch_ids],
+            boundary,
+        )
+        headers = {**HEADERS, "Content-Type": f"multipart/mixed; boundary={boundary}"}
+        async with sem:
+            await limiter.acquire(len(batch_ids))
+            r = await request_with_backoff(
+                client, "POST", BATCH_URL, headers=headers, content=body
+            )
+        results = _parse_batch_response(r)
+
+        messages: List[Dict[str, Any] | None] = [None] * len(batch_ids)
+        retry: List[int] = []
+        for i, mid in enumerate(batch_ids):
+            status_code, data = results.get(i, (None, None))
+            if status_code is not None and status_code < 400:
+                messages[i] = data
+            elif status_code is None or status_code in RETRYABLE_SUBREQUEST_STATUS:
+                # Missing or transient per-message failure: retry alone.
+                retry.append(i)
+            else:
+                # e.g. 401/403/404 - a lone GET would fail the same way.
+                raise RuntimeError(
+                    f"Gmail returned {status_code} for message {mid}: {data}"
+                )
+
+        retried = await asyncio.gather(*(one(batch_ids[i]) for i in retry))
+        for i, data in zip(retry, retried):
+            messages[i] = data
+        return messages
+
+    # gather schedules all batches; limiter+sem prevents flooding
+    batches = [
+        message_ids[i : i + batch_size] for i in range(0, len(message_ids), batch_size)
+    ]
+    results = await asyncio.gather(*(one_batch(b) for b in batches))
+    return [m for batch in results for m in batch]
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Client for script runs, pooled like the app's `app.state.http_client`."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=50, keepalive_expiry=30
+        ),
+    )
 
 
 async def test_email_fetch():
@@ -314,7 +388,10 @@ if __name__ == "__main__":
     # # start small first
     # sample = message_ids[:500]
 
-    # results = asyncio.run(fetch_messages_by_ids(sample, concurrency=15, rps=50))
+    # async def run():
+    #     async with new_async_client() as client:
+    #         return await fetch_messages_by_ids(client, sample, concurrency=15, rps=50)
+    # results = asyncio.run(run())
     # out_path.write_text(json.dumps(results, indent=2))
     # print(f"Wrote {len(results)} messages to {out_path}")
     # asyncio.run(test_email_fetch())
@@ -365,7 +442,10 @@ if __name__ == "__main__":
 
     # ==============================
     # MSG_ID = "195b366fe6f6c97f"
-    # message_content = asyncio.run(fetch_messages_by_ids(message_ids=[MSG_ID]))
+    # async def run():
+    #     async with new_async_client() as client:
+    #         return await fetch_messages_by_ids(client, message_ids=[MSG_ID])
+    # message_content = asyncio.run(run())
     # FILE_PATH: str = (
     #     "/Users/raman/Documents/Development/Projects/notes-lab/app/data/json"
     # )
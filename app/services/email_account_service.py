@@ -2,20 +2,41 @@
 
 import uuid
 from datetime import datetime, timezone
+from threading import RLock
 from typing import Optional
-from celery import chain
-from celery.result import AsyncResult
+from cachetools import TLRUCache
+from redis import Redis
 from app.repositories.email_account import EmailAccountRepository
 from app.repositories.user import UserRepository
 from app.repositories.google_auth import GoogleAuthDataRepository
-from app.models.models import EmailAccount
+from app.models.models import EmailAccount, GoogleAuthData
 from app.enums import EmailProvider
-from app.tasks.celery.tasks import (
-    expand_emails_per_thread,
-    fetch_email_content,
-    prepare_email_chunks,
-    sync_email_metadata_orchestrator,
-)
+
+# How long the per-job enqueue guard lives. A job ID is only ever enqueued
+# once, so this just has to outlast the longest time a job can sit QUEUED; it
+# exists only to bound Redis memory.
+SYNC_ENQUEUE_GUARD_TTL_SECONDS = 24 * 60 * 60
+
+
+def _sync_enqueue_guard_key(email_account_id: str, job_id: str) -> str:
+    return f"sync:enqueued:{email_account_id}:{job_id}"
+
+
+# Credential checks rarely change between polls: passing checks are cached per
+# account for up to CREDENTIALS_CACHE_TTL_SECONDS, never past the refresh
+# token's expiry. Failures are not cached, so a freshly connected account is
+# accepted at once. The cache is per process: auth data writes evict via
+# `invalidate_auth_credentials` only in the process that made them.
+CREDENTIALS_CACHE_TTL_SECONDS = 30
+# Values are the entry's TTL in seconds.
+_credentials_cache = TLRUCache(maxsize=2048, ttu=lambda _key, ttl, now: now + ttl)
+_credentials_cache_lock = RLock()
+
+
+def invalidate_auth_credentials(email_account_id: uuid.UUID) -> None:
+    """Drop the cached credential check for an EmailAccount."""
+    with _credentials_cache_lock:
+        _credentials_cache.pop(email_account_id, None)
 
 
 class EmailAccountService:
@@ -26,10 +47,12 @@ class EmailAccountService:
         email_account_repo: EmailAccountRepository,
         user_repo: UserRepository,
         google_auth_repo: GoogleAuthDataRepository,
+        redis: Redis | None = None,
     ):
         self.email_account_repo = email_account_repo
         self.user_repo = user_repo
         self.google_auth_repo = google_auth_repo
+        self.redis = redis
 
     def create_email_account(
         self, user_id: uuid.UUID, email: str, provider: EmailProvider
@@ -64,6 +87,31 @@ class EmailAccountService:
         )
         return email_account
 
+    def link_new_email_account(
+        self, user_id: uuid.UUID, email: str, provider: EmailProvider
+    ) -> EmailAccount:
+        """
+        Create an EmailAccount for a user the caller has already verified
+        exists and has no account for `email`, without re-checking either.
+
+        Args:
+            user_id: ID of the user who owns this email account
+            email: Email address
+            provider: Email provider (GMAIL, OUTLOOK, etc.)
+
+        Returns:
+            EmailAccount: Created EmailAccount object
+
+        Raises:
+            ValueError: If the email account already belongs to another user
+        """
+        email_account = self.email_account_repo.create_if_not_exists(
+            user_id=user_id, email=email, provider=provider
+        )
+        if email_account is None:
+            raise ValueError(f"Email account {email} is already linked to another user")
+        return email_account
+
     def get_or_create_email_account(
         self, user_id: uuid.UUID, email: str, provider: EmailProvider
     ) -> EmailAccount:
@@ -100,15 +148,46 @@ class EmailAccountService:
             - is_valid: True if credentials are valid, False otherwise
             - error_message: None if valid, error message if invalid
         """
-        email_account = self.email_account_repo.find_by_id(email_account_id)
-        if not email_account:
-            return False, f"EmailAccount with id {email_account_id} not found"
+        with _credentials_cache_lock:
+            cached = _credentials_cache.get(email_account_id)
+        if cached is not None:
+            return True, None
 
-        # Get auth data for this email account
-        google_auth_data = self.google_auth_repo.find_by_email_account_id(
+        email_account, google_auth_data = self.email_account_repo.find_with_auth(
             email_account_id
         )
+        if not email_account:
+            is_valid, error_message = (
+                False,
+                f"EmailAccount with id {email_account_id} not found",
+            )
+        else:
+            is_valid, error_message = self._check_auth_credentials_valid(
+                google_auth_data
+            )
+
+        if not is_valid:
+            return is_valid, error_message
 
+        ttl = CREDENTIALS_CACHE_TTL_SECONDS
+        if google_auth_data.refresh_token_expires_at:
+            ttl = min(
+                ttl,
+                (
+                    google_auth_data.refresh_token_expires_at
+                    - datetime.now(timezone.utc)
+                ).total_seconds(),
+            )
+        if ttl > 0:
+            with _credentials_cache_lock:
+                _credentials_cache[email_account_id] = ttl
+        return is_valid, error_message
+
+    @staticmethod
+    def _check_auth_credentials_valid(
+        google_auth_data: GoogleAuthData | None,
+    ) -> tuple[bool, Optional[str]]:
+        """Validate already-loaded auth data; see `check_auth_credentials_valid`."""
         if not google_auth_data:
             return False, "No authentication data found for this email account"
 
@@ -137,81 +216,70 @@ class EmailAccountService:
         self,
         job_id: uuid.UUID,
         email_account_id: uuid.UUID,
-        idempotency_key: Optional[str] = None,
     ) -> dict:
         """
         Start email sync job for an email account.
 
+        Enqueuing is idempotent per job: repeat calls for a job that was
+        already enqueued (e.g. a double-clicked "sync" while it is still
+        QUEUED) do nothing.
+
         Args:
+            job_id: ID of the WorkflowJob tracking this sync
             email_account_id: ID of the EmailAccount to sync
-            idempotency_key: Optional key to prevent duplicate job submissions
 
         Returns:
-            dict: Job status with task_id and status
+            dict: Job status with job_id and status
 
         Raises:
             ValueError: If email account not found or credentials invalid
         """
-        # Verify email account exists
-        email_account = self.email_account_repo.find_by_id(email_account_id)
-        if not email_account:
-            raise ValueError(f"EmailAccount with id {email_account_id} not found")
-
-        # Check if credentials are valid
+        # Verify the email account exists and its credentials are valid
         is_valid, error_message = self.check_auth_credentials_valid(email_account_id)
         if not is_valid:
             raise ValueError(error_message or "Credentials are invalid")
 
-        # # Generate idempotency key if not provided
-        # if not idempotency_key:
-        #     idempotency_key = (
-        #         f"sync_{email_account_id}_{int(datetime.now(timezone.utc).timestamp())}"
-        #     )
+        job_id, email_account_id = str(job_id), str(email_account_id)
+
+        # Enqueue each job's task chain at most once. Keyed on the job so a
+        # new job after a failure always runs.
+        redis_key = _sync_enqueue_guard_key(email_account_id, job_id)
+        if self.redis is not None and not self.redis.set(
+            redis_key, job_id, nx=True, ex=SYNC_ENQUEUE_GUARD_TTL_SECONDS
+        ):
+            return {
+                "job_id": job_id,
+                "status": "pending",
+                "email_account_id": email_account_id,
+            }
+
+        # Imported here so processes that never enqueue (e.g. the OAuth
+        # callback path) don't pay for loading Celery and every task module.
+        from celery import chain
+        from app.tasks.celery.tasks import (
+            expand_emails_per_thread,
+            fetch_email_content,
+            prepare_email_chunks,
+            sync_email_metadata_orchestrator,
+        )
 
         # Submit Celery task chain
-        job_id, email_account_id = str(job_id), str(email_account_id)
         task_chain = chain(
-            sync_email_metadata_orchestrator.si(
-                job_id, email_account_id, idempotency_key
-            )
+            sync_email_metadata_orchestrator.si(job_id, email_account_id)
             | expand_emails_per_thread.si(job_id, email_account_id)
             | fetch_email_content.si(job_id, email_account_id)
             | prepare_email_chunks.si(job_id, email_account_id)
         )
-        res = task_chain()
+        try:
+            res = task_chain()
+        except Exception:
+            # Nothing was enqueued; let the next attempt through.
+            if self.redis is not None:
+                self.redis.delete(redis_key)
+            raise
         print(res)
         return {
             "job_id": job_id,
             "status": "pending",
-            "idempotency_key": idempotency_key,
-            "email_account_id": str(email_account_id),
+            "email_account_id": email_account_id,
         }
-
-    def get_sync_job_status(self, task_id: str) -> dict:
-        """
-        Get the status of a sync job.
-
-        Args:
-            task_id: Celery task ID
-
-        Returns:
-            dict: Job status information
-        """
-        task_result = AsyncResult(task_id)
-
-        response = {
-            "task_id": task_id,
-            "status": task_result.state.lower(),  # PENDING, SUCCESS, FAILURE, etc.
-        }
-
-        if task_result.ready():
-            if task_result.successful():
-                response["result"] = task_result.result
-                response["status"] = "completed"
-            else:
-                response["error"] = str(task_result.info)
-                response["status"] = "failed"
-        else:
-            response["status"] = "pending"
-
-        return response
@@ -59,7 +59,12 @@ class EmailIngestionService:
 
     def batch_upsert_email_metadata(self, *, data: List[Dict]):
         try:
-            rows = [_convert_gmail_msg_to_email(obj).model_dump() for obj in data]
+            rows = [
+                _convert_gmail_msg_to_email(obj).model_dump(
+                    exclude={"id", "created_at", "updated_at"}
+                )
+                for obj in data
+            ]
             self.email_repo.batch_upsert_metadata(rows=rows)
         except Exception as ex:
             print(f"Exception in batch_upsert_email_metadata: {ex}")
@@ -1,30 +1,38 @@
 """Pure helper functions for Google OAuth URL generation (no database access)."""
 
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
 from app.config import get_settings
 
+GOOGLE_OAUTH_REQUIRED_SCOPES = (
+    "openid https://www.googleapis.com/auth/userinfo.email "
+    "https://www.googleapis.com/auth/userinfo.profile "
+    "https://www.googleapis.com/auth/gmail.readonly"
+)
+# Built once at import; scope validation runs on every OAuth callback.
+REQUIRED_SCOPES: frozenset[str] = frozenset(GOOGLE_OAUTH_REQUIRED_SCOPES.split())
+
 
 class GoogleOAuthHelper:
     """Pure helper class for Google OAuth URL generation."""
 
     GOOGLE_OAUTH_ENDPOINT = "https://accounts.google.com/o/oauth2/v2/auth"
-    REQUIRED_SCOPES = (
-        "openid https://www.googleapis.com/auth/userinfo.email "
-        "https://www.googleapis.com/auth/userinfo.profile "
-        "https://www.googleapis.com/auth/gmail.readonly"
+    REQUIRED_SCOPES = GOOGLE_OAUTH_REQUIRED_SCOPES
+    # Everything but redirect_uri and state is fixed, so encode it once at
+    # import rather than on every login redirect.
+    _STATIC_QS = urlencode(
+        {
+            "client_id": get_settings().google_oauth_client_id,
+            "response_type": "code",
+            "access_type": "offline",
+            "prompt": "consent",
+            "scope": GOOGLE_OAUTH_REQUIRED_SCOPES,
+        }
     )
 
     @staticmethod
     def generate_auth_url(redirect_uri: str, state: str) -> str:
         """Generate Google OAuth authorization URL."""
-        settings = get_settings()
-        params = {
-            "client_id": settings.google_oauth_client_id,
-            "redirect_uri": redirect_uri,
-            "state": state,
-            "response_type": "code",
-            "access_type": "offline",
-            "prompt": "consent",
-            "scope": GoogleOAuthHelper.REQUIRED_SCOPES,
-        }
-        return f"{GoogleOAuthHelper.GOOGLE_OAUTH_ENDPOINT}?{urlencode(params)}"
+        return (
+            f"{GoogleOAuthHelper.GOOGLE_OAUTH_ENDPOINT}?{GoogleOAuthHelper._STATIC_QS}"
+            f"&redirect_uri={quote_plus(redirect_uri)}&state={quote_plus(state)}"
+        )
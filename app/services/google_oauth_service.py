@@ -1,10 +1,18 @@
 from datetime import datetime, timedelta, timezone
 import httpx
 import uuid
+from fastapi.concurrency import run_in_threadpool
 from app.config import get_settings
 from app.repositories.user import UserRepository
 from app.repositories.google_auth import GoogleAuthDataRepository
-from app.services.email_account_service import EmailAccountService
+from app.services.email_account_service import (
+    EmailAccountService,
+    invalidate_auth_credentials,
+)
+from app.services.google_oauth_helper import (
+    GOOGLE_OAUTH_REQUIRED_SCOPES,
+    REQUIRED_SCOPES,
+)
 from app.models.models import User, GoogleAuthData, EmailAccount
 from app.enums import EmailProvider
 
@@ -14,24 +22,25 @@ class GoogleOAuthService:
 
     GOOGLE_USERINFO_ENDPOINT = "https://www.googleapis.com/oauth2/v2/userinfo"
     GOOGLE_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
-    REQUIRED_SCOPES = (
-        "openid https://www.googleapis.com/auth/userinfo.email "
-        "https://www.googleapis.com/auth/userinfo.profile "
-        "https://www.googleapis.com/auth/gmail.readonly"
-    )
+    REQUIRED_SCOPES = GOOGLE_OAUTH_REQUIRED_SCOPES
 
     def __init__(
         self,
         user_repo: UserRepository,
         google_auth_repo: GoogleAuthDataRepository,
         email_account_service: EmailAccountService,
+        http_client: httpx.AsyncClient,
     ):
         self.user_repo = user_repo
         self.google_auth_repo = google_auth_repo
         self.email_account_service = email_account_service
-        self.settings = get_settings()
+        self.http_client = http_client
+        # Snapshot the credentials; they are read on every token request.
+        settings = get_settings()
+        self._client_id = settings.google_oauth_client_id
+        self._client_secret = settings.google_oauth_client_secret
 
-    def exchange_code_for_tokens(self, code: str, redirect_uri: str) -> dict:
+    async def exchange_code_for_tokens(self, code: str, redirect_uri: str) -> dict:
         """
         Exchange authorization code for access and refresh tokens.
 
@@ -44,16 +53,18 @@ class GoogleOAuthService:
         payload = {
             "code": code,
             "grant_type": "authorization_code",
-            "client_id": self.settings.google_oauth_client_id,
-            "client_secret": self.settings.google_oauth_client_secret,
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
             "redirect_uri": redirect_uri,
         }
 
-        response = httpx.post(url=self.GOOGLE_TOKEN_ENDPOINT, data=payload)
+        response = await self.http_client.post(
+            url=self.GOOGLE_TOKEN_ENDPOINT, data=payload
+        )
         response.raise_for_status()
         return response.json()
 
-    def handle_oauth_callback(
+    async def handle_oauth_callback(
         self, code: str, redirect_uri: str, user_id: uuid.UUID
     ) -> tuple[User, EmailAccount, GoogleAuthData]:
         """
@@ -73,7 +84,7 @@ class GoogleOAuthService:
             ValueError: If required scopes are missing or user doesn't exist.
         """
         # Exchange code for tokens
-        tokens = self.exchange_code_for_tokens(code, redirect_uri)
+        tokens = await self.exchange_code_for_tokens(code, redirect_uri)
 
         # Validate scopes
         token_scopes = tokens.get("scope", "")
@@ -81,27 +92,59 @@ class GoogleOAuthService:
         if not is_valid:
             raise ValueError(f"Required scopes were not permitted: {missing_scopes}")
 
-        # Verify user exists
-        user = self.user_repo.find_by_id(user_id)
-        if not user:
-            raise ValueError(
-                f"User with id {user_id} does not exist. User must be registered first."
-            )
-
         # Fetch user info from Google to get email
-        user_info = self.fetch_user_info_from_google(tokens["access_token"])
+        user_info = await self.fetch_user_info_from_google(tokens["access_token"])
         google_email = user_info["email"]
         google_user_id = user_info["id"]
 
-        # Create or get EmailAccount for this user
-        email_account = self.email_account_service.get_or_create_email_account(
+        # The session is synchronous: run the database work in the threadpool
+        # (as FastAPI does for sync endpoints) instead of on the event loop.
+        return await run_in_threadpool(
+            self._link_email_account_and_save_auth,
             user_id=user_id,
-            email=google_email,
-            provider=EmailProvider.GMAIL,
+            google_email=google_email,
+            google_user_id=google_user_id,
+            tokens=tokens,
+        )
+
+    def _link_email_account_and_save_auth(
+        self,
+        *,
+        user_id: uuid.UUID,
+        google_email: str,
+        google_user_id: str,
+        tokens: dict,
+    ) -> tuple[User, EmailAccount, GoogleAuthData]:
+        """Database half of `handle_oauth_callback`."""
+        # Load the user, their EmailAccount for this address and its auth data
+        # in a single JOIN rather than one query each.
+        user, email_account, existing_auth = (
+            self.user_repo.find_with_email_account_and_google_auth(
+                user_id=user_id, email=google_email
+            )
         )
+        if not user:
+            raise ValueError(
+                f"User with id {user_id} does not exist. User must be registered first."
+            )
+
+        # Create EmailAccount for this user on first connect. The JOIN above
+        # already proved the user exists without an account for this address,
+        # so insert directly rather than re-checking both.
+        if not email_account:
+            email_account = self.email_account_service.link_new_email_account(
+                user_id=user_id,
+                email=google_email,
+                provider=EmailProvider.GMAIL,
+            )
+
+        # Auth data may exist under a previous EmailAccount for this Google user
+        if not existing_auth and google_user_id:
+            existing_auth = self.google_auth_repo.find_by_google_user_id(google_user_id)
 
         # Save or update auth data linked to EmailAccount
-        google_auth_data = self.save_or_update_google_auth(
+        google_auth_data = self._upsert_google_auth(
+            existing_auth,
             email_account_id=email_account.id,
             user_id=user_id,
             access_token=tokens["access_token"],
@@ -115,14 +158,12 @@ class GoogleOAuthService:
 
     def validate_scopes(self, token_scopes: str) -> tuple[bool, list[str]]:
         """Validate that required scopes are present in token response."""
-        token_scopes_set = set(token_scopes.split())
-        required_scopes_set = set(self.REQUIRED_SCOPES.split())
-        missing_scopes = required_scopes_set - token_scopes_set
-        return (len(missing_scopes) == 0, list(missing_scopes))
+        missing_scopes = REQUIRED_SCOPES.difference(token_scopes.split())
+        return (not missing_scopes, list(missing_scopes))
 
-    def fetch_user_info_from_google(self, access_token: str) -> dict:
+    async def fetch_user_info_from_google(self, access_token: str) -> dict:
         """Fetch user information from Google using access token."""
-        response = httpx.get(
+        response = await self.http_client.get(
             self.GOOGLE_USERINFO_ENDPOINT,
             headers={"Authorization": f"Bearer {access_token}"},
         )
@@ -140,11 +181,6 @@ class GoogleOAuthService:
         google_user_id: str | None = None,
     ) -> GoogleAuthData:
         """Save or update Google auth tokens for an EmailAccount."""
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-        refresh_token_expires_at = datetime.now(timezone.utc) + timedelta(
-            seconds=refresh_token_expires_in
-        )
-
         # Try to find existing auth data by email_account_id first
         existing_auth = self.google_auth_repo.find_by_email_account_id(email_account_id)
 
@@ -152,7 +188,38 @@ class GoogleOAuthService:
         if not existing_auth and google_user_id:
             existing_auth = self.google_auth_repo.find_by_google_user_id(google_user_id)
 
+        return self._upsert_google_auth(
+            existing_auth,
+            email_account_id=email_account_id,
+            user_id=user_id,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=expires_in,
+            refresh_token_expires_in=refresh_token_expires_in,
+            google_user_id=google_user_id,
+        )
+
+    def _upsert_google_auth(
+        self,
+        existing_auth: GoogleAuthData | None,
+        *,
+        email_account_id: uuid.UUID,
+        user_id: uuid.UUID,
+        access_token: str,
+        refresh_token: str,
+        expires_in: int,
+        refresh_token_expires_in: int,
+        google_user_id: str | None = None,
+    ) -> GoogleAuthData:
+        """Update `existing_auth` with fresh tokens, or create it if None."""
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=expires_in)
+        refresh_token_expires_at = now + timedelta(seconds=refresh_token_expires_in)
+
+        invalidate_auth_credentials(email_account_id)
         if existing_auth:
+            # The auth data may be moving off another EmailAccount
+            invalidate_auth_credentials(existing_auth.email_account_id)
             # Update existing auth data
             existing_auth.email_account_id = email_account_id
             existing_auth.user_id = user_id
@@ -176,9 +243,13 @@ class GoogleOAuthService:
                 refresh_token_expires_at=refresh_token_expires_at,
             )
 
-    def refresh_access_token(self, google_user_id: str) -> GoogleAuthData:
+    async def refresh_access_token(self, google_user_id: str) -> GoogleAuthData:
         """Refresh the access token using a Google user ID."""
-        google_auth_data = self.google_auth_repo.find_by_google_user_id(google_user_id)
+        # Only the token request is awaited on the event loop; the synchronous
+        # session work runs in the threadpool, as in `handle_oauth_callback`.
+        google_auth_data = await run_in_threadpool(
+            self.google_auth_repo.find_by_google_user_id, google_user_id
+        )
 
         if not google_auth_data:
             raise ValueError(
@@ -186,16 +257,24 @@ class GoogleOAuthService:
             )
 
         payload = {
-            "client_id": self.settings.google_oauth_client_id,
-            "client_secret": self.settings.google_oauth_client_secret,
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
             "grant_type": "refresh_token",
             "refresh_token": google_auth_data.refresh_token,
         }
 
-        response = httpx.post(self.GOOGLE_TOKEN_ENDPOINT, data=payload)
+        response = await self.http_client.post(self.GOOGLE_TOKEN_ENDPOINT, data=payload)
         response.raise_for_status()
         tokens = response.json()
 
+        return await run_in_threadpool(
+            self._save_refreshed_tokens, google_auth_data, tokens
+        )
+
+    def _save_refreshed_tokens(
+        self, google_auth_data: GoogleAuthData, tokens: dict
+    ) -> GoogleAuthData:
+        """Database half of `refresh_access_token`."""
         google_auth_data.access_token = tokens["access_token"]
 
         if "expires_in" in tokens:
@@ -206,4 +285,6 @@ class GoogleOAuthService:
         if "refresh_token" in tokens:
             google_auth_data.refresh_token = tokens["refresh_token"]
 
+        invalidate_auth_credentials(google_auth_data.email_account_id)
+
         return self.google_auth_repo.update(google_auth_data)
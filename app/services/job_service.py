@@ -1,11 +1,16 @@
-from datetime import datetime
-from time import timezone
 from sqlmodel import select
 from app.models.models import WorkflowJob
 from app.repositories.job_repository import JobRepository
-from app.enums import ResourceType, JobType, JobStatus
+from app.enums import ACTIVE_JOB_STATUSES, ResourceType, JobType, JobStatus
+from app.logging import get_logger
 import uuid
 
+logger = get_logger(__name__)
+
+# Bounds the insert/find retry in `get_or_create_active_job`; each retry needs
+# an active job to finish between our two statements, so this is never hot.
+GET_OR_CREATE_ACTIVE_JOB_ATTEMPTS = 3
+
 
 class JobService:
 
@@ -26,33 +31,95 @@ class JobService:
             resource_id=email_account_id,
             resource_type=ResourceType.EMAIL_ACCOUNT,
             job_type=JobType.MAILBOX_SYNC,
-            statuses=[JobStatus.QUEUED, JobStatus.RUNNING],
+            statuses=ACTIVE_JOB_STATUSES,
         )
         return job is not None
 
     def get_or_create_active_job(
         self, resource_type: ResourceType, resource_id: uuid.UUID, job_type: JobType
     ) -> (WorkflowJob, bool):
-        workflow_job = self.job_repo.find_job_by_resource(
-            resource_id=resource_id,
-            resource_type=resource_type,
-            job_type=job_type,
-            statuses=[JobStatus.QUEUED, JobStatus.RUNNING],
-        )
-
-        if not workflow_job:
-            print(
-                f"Unable to fetch active job for job_type={job_type}, resource_type={resource_type}, resource_id={resource_id}"
-            )
-            workflow_job = self.job_repo.create(
+        # Insert first: the unique active-job index makes this race-free, and
+        # the common "new sync" case costs a single statement. If the insert
+        # conflicts but the conflicting job finishes before we can read it,
+        # the slot is free again, so retry the insert.
+        for _ in range(GET_OR_CREATE_ACTIVE_JOB_ATTEMPTS):
+            workflow_job = self.job_repo.create_if_no_active(
                 resource_id=resource_id,
                 resource_type=resource_type,
                 job_type=job_type,
                 job_status=JobStatus.QUEUED,
             )
-            return workflow_job, True
+            if workflow_job:
+                logger.debug(
+                    "Created active job %s for job_type=%s, resource_type=%s, resource_id=%s",
+                    workflow_job.id,
+                    job_type,
+                    resource_type,
+                    resource_id,
+                )
+                return workflow_job, True
+
+            workflow_job = self.job_repo.find_job_by_resource(
+                resource_id=resource_id,
+                resource_type=resource_type,
+                job_type=job_type,
+                statuses=ACTIVE_JOB_STATUSES,
+            )
+            if workflow_job:
+                return workflow_job, False
 
-        return workflow_job, False
+        raise RuntimeError(
+            f"Could not create or find an active {job_type} job for "
+            f"{resource_type} {resource_id}"
+        )
+
+    def get_job_status(self, job_id: uuid.UUID) -> dict | None:
+        """
+        Get the status of a job from its WorkflowJob row.
+
+        Args:
+            job_id: ID of the WorkflowJob
+
+        Returns:
+            dict: Job status information, or None if the job doesn't exist
+        """
+        job = self.job_repo.find_by_id(id=job_id)
+        if job is None:
+            return None
+        return self._format_job_status(job)
+
+    def get_job_statuses(self, job_ids: list[uuid.UUID]) -> list[dict]:
+        """
+        Get the status of many jobs with a single query.
+
+        Args:
+            job_ids: IDs of the WorkflowJobs
+
+        Returns:
+            list[dict]: Job status information for the jobs that exist, in the
+            order of job_ids
+        """
+        jobs = {job.id: job for job in self.job_repo.find_by_ids(job_ids)}
+        return [
+            self._format_job_status(jobs[job_id])
+            for job_id in job_ids
+            if job_id in jobs
+        ]
+
+    @staticmethod
+    def _format_job_status(job: WorkflowJob) -> dict:
+        return {
+            "job_id": job.id,
+            "status": job.status.value,
+            "phase": job.phase.value if job.phase else None,
+            "progress_current": job.progress_current,
+            "progress_total": job.progress_total,
+            "error": job.error_message,
+        }
+
+    def update_progress(self, job_id: uuid.UUID, progress_current: int) -> None:
+        """Record a progress ping; cheaper than `update_job` for this one field."""
+        self.job_repo.update_progress(job_id, progress_current)
 
     def update_job(
         self,
@@ -66,35 +133,20 @@ class JobService:
         cursor=None,
         started_at=None,
         completed_at=None,
-    ) -> WorkflowJob:
-
-        job = self.job_repo.find_by_id(id=job_id)
-
-        if status is not None:
-            job.status = status
-
-        if progress_current is not None:
-            job.progress_current = progress_current
-
-        if progress_total is not None:
-            job.progress_total = progress_total
-
-        # if cursor is not None:
-        #     job.cursor = cursor
-
-        if phase is not None:
-            job.phase = phase
-
-        if error_message is not None:
-            job.error_message = error_message
-
-        # if started_at is not None:
-        #     job.started_at = started_at
-
-        # if completed_at is not None:
-        #     job.completed_at = completed_at
-
-        # job.last_heartbeat_at = datetime.now(timezone.utc)
-        job = self.job_repo.update(job)
+    ) -> WorkflowJob | None:
+
+        fields = {
+            "status": status,
+            "progress_current": progress_current,
+            "progress_total": progress_total,
+            # "cursor": cursor,
+            "phase": phase,
+            "error_message": error_message,
+            # "started_at": started_at,
+            # "completed_at": completed_at,
+        }
+        job = self.job_repo.partial_update(
+            job_id, **{k: v for k, v in fields.items() if v is not None}
+        )
 
         return job
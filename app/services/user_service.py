@@ -23,11 +23,11 @@ class UserService:
         Raises:
             ValueError: If email is already registered
         """
-        existing = self.user_repo.find_by_email(email)
-        if existing:
+        # Existence check and insert happen in one race-free statement.
+        user = self.user_repo.create_if_not_exists(email=email, is_registered=False)
+        if user is None:
             raise ValueError(
                 "Please check your inbox for a verification link to confirm your email address."
             )
 
-        user = self.user_repo.create(email=email, is_registered=False)
         return user
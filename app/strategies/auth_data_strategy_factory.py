@@ -1,5 +1,7 @@
 """Factory for creating auth data strategies."""
 
+from functools import lru_cache
+
 from app.enums import EmailProvider
 from app.strategies.auth_data_strategy import AuthDataStrategy
 from app.strategies.gmail_auth_data_strategy import GmailAuthDataStrategy
@@ -15,9 +17,13 @@ class AuthDataStrategyFactory:
     }
 
     @classmethod
+    @lru_cache(maxsize=None)
     def create(cls, provider: EmailProvider) -> AuthDataStrategy:
         """
-        Create an auth data strategy instance for the given provider.
+        Return the auth data strategy instance for the given provider.
+
+        Auth data strategies are stateless, so one instance per provider is
+        shared for the life of the process.
 
         Args:
             provider: Email provider enum
@@ -60,6 +60,35 @@ class EmailProviderStrategy(ABC):
         """
         pass
 
+    @abstractmethod
+    async def stream_messages(
+        self,
+        *,
+        access_token: str,
+        user_identifier: str,
+        format: str = "metadata",
+        num_workers: int = 4,
+        max_results_per_page: int = 500,
+        include_spam_trash: bool = False,
+        label_ids: List[str] = [],
+        q: str | None = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        List and fetch messages as a pipeline, overlapping the two stages.
+
+        Args:
+            access_token: OAuth access token
+            user_identifier: Provider-specific user identifier
+            format: Message format to fetch
+            num_workers: Number of concurrent page fetchers
+            max_results_per_page: Maximum results per page
+            include_spam_trash: Whether to include spam/trash messages
+
+        Returns:
+            Async iterator of message dictionary lists, one per listed page
+        """
+        pass
+
     @abstractmethod
     async def fetch_messages_by_thread_ids(
         self,
@@ -11,6 +11,18 @@ class GmailStrategy(EmailProviderStrategy):
 
     def __init__(self):
         self._client = GmailClient()
+        self._access_token: str | None = None
+        self._auth_headers: dict[str, str] = {}
+
+    def _headers(self, access_token: str) -> dict[str, str]:
+        """Return request headers for `access_token`, built once per token."""
+        if access_token != self._access_token:
+            self._access_token = access_token
+            self._auth_headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            }
+        return self._auth_headers
 
     def get_provider(self) -> EmailProvider:
         """Return Gmail provider."""
@@ -27,10 +39,7 @@ class GmailStrategy(EmailProviderStrategy):
         q: str | None = None,
     ) -> AsyncIterator[List[str]]:
         """List Gmail message IDs."""
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
+        headers = self._headers(access_token)
         async for batch in self._client.list_messages(
             google_user_id=user_identifier,
             headers=headers,
@@ -50,14 +59,37 @@ class GmailStrategy(EmailProviderStrategy):
         format: str = "metadata",
     ) -> List[Dict[str, Any]]:
         """Fetch Gmail messages by IDs."""
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
-        return await self._client.fetch_messages_by_ids(
+        headers = self._headers(access_token)
+        return await self._client.fetch_messages_by_ids_batched(
             message_ids, headers=headers, google_user_id=user_identifier, format=format
         )
 
+    async def stream_messages(
+        self,
+        *,
+        access_token: str,
+        user_identifier: str,
+        format: str = "metadata",
+        num_workers: int = 4,
+        max_results_per_page: int = 500,
+        include_spam_trash: bool = False,
+        label_ids: List[str] = [],
+        q: str | None = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Page through Gmail message IDs while fetching earlier pages."""
+        headers = self._headers(access_token)
+        async for messages in self._client.stream_messages(
+            google_user_id=user_identifier,
+            headers=headers,
+            format=format,
+            num_workers=num_workers,
+            max_results_per_page=max_results_per_page,
+            include_spam_trash=include_spam_trash,
+            label_ids=label_ids,
+            q=q,
+        ):
+            yield messages
+
     async def fetch_messages_by_thread_ids(
         self,
         thread_ids: List[str],
@@ -69,10 +101,7 @@ class GmailStrategy(EmailProviderStrategy):
         """
         Fetch Gmail messages by thread IDs and return a flat list of messages.
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
+        headers = self._headers(access_token)
         threads = await self._client.fetch_messages_by_thread_ids(
             thread_ids,
             google_user_id=user_identifier,
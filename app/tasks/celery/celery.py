@@ -13,3 +13,6 @@ app = Celery(
 
 app.conf.update(worker_hijack_root_logger=False)
 app.conf.update(enable_utc=True, include="app.tasks.celery.tasks")
+# Job progress and outcome live on the WorkflowJob row, so task results are
+# never read back; don't write them to the backend.
+app.conf.update(task_ignore_result=True)
@@ -1,5 +1,7 @@
 import asyncio
 import chunk
+import time
+import httpx
 from itertools import chain
 import uuid
 from datetime import datetime, timezone
@@ -37,6 +39,25 @@ from app.strategies.chunking.base import Chunkifier
 from app.strategies.chunking.paragraph import ParagraphChunkifier
 from app.strategies.strategy_factory import EmailProviderStrategyFactory
 from app.tasks.celery.celery import app
+from app.utils.token_cache import (
+    get_access_token,
+    invalidate_access_token,
+    put_access_token,
+)
+
+# Progress writes are coalesced: flush at most every N seconds or N messages.
+PROGRESS_FLUSH_INTERVAL_SECONDS = 5.0
+PROGRESS_FLUSH_MESSAGES = 5000
+
+
+# (label, search query) pairs walked by the metadata sync.
+METADATA_SYNC_LABEL_QUERIES = (
+    (
+        "INBOX",
+        "category:primary -category:promotions -category:social -category:updates",
+    ),
+    ("SENT", "-from:(noreply@ OR no-reply@ OR do-not-reply@ OR notifications@)"),
+)
 
 
 # Move to utils
@@ -46,7 +67,7 @@ def _attach_context(m: dict, user_id: str, email_account_id: str) -> dict:
     return m
 
 
-@app.task(name="ingest_email_account")
+@app.task(name="ingest_email_account", ignore_result=True)
 def sync_email_metadata_orchestrator(
     job_id: str, email_account_id: str, idempotency_key: str | None = None
 ) -> dict:
@@ -66,32 +87,43 @@ def sync_email_metadata_orchestrator(
 
 
 async def _sync_email_metadata_orchestrator(
-    job_id: uuid.UUID,
+    job_id: str,
     email_account_id: str,
     idempotency_key: str | None = None,
 ):
     """Async implementation of email ingestion."""
+    job_uuid = uuid.UUID(job_id)
     email_account_uuid = uuid.UUID(email_account_id)
     strategy = None
+    counts = {"total": 0, "inbox": 0, "retained_inbox": 0, "sent": 0}
 
-    try:
-        with celery_session() as session:
+    # One session for the whole task, including the failure path.
+    with celery_session() as session:
+        job_repository: JobRepository = JobRepository(session)
+        job_service: JobService = JobService(job_repository=job_repository)
+        try:
             email_repository: EmailRepository = EmailRepository(session=session)
             email_ingestion_service = EmailIngestionService(
                 email_repository=email_repository
             )
-            job_repository: JobRepository = JobRepository(session)
-            job_service: JobService = JobService(job_repository=job_repository)
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.RUNNING,
                 phase=JobPhase.METADATA_DISCOVERY,
             )
-            # Load email account
+            # Reuse an access token loaded by an earlier task while it is still
+            # comfortably inside its expiry. Otherwise load the email account
+            # and its auth data together in one query.
             email_account_repo = EmailAccountRepository(session=session)
-            email_account: EmailAccount | None = email_account_repo.find_by_id(
-                email_account_uuid
-            )
+            cached_token = get_access_token(email_account_uuid)
+            if cached_token is not None:
+                email_account: EmailAccount | None = email_account_repo.find_by_id(
+                    email_account_uuid
+                )
+            else:
+                email_account, auth_data = email_account_repo.find_with_auth(
+                    email_account_uuid
+                )
 
             if email_account is None:
                 return {
@@ -99,119 +131,143 @@ async def _sync_email_metadata_orchestrator(
                     "message": f"EmailAccount with id {email_account_id} not found",
                 }
 
-            # Use auth data strategy to load provider-specific auth data
-            auth_data_strategy = AuthDataStrategyFactory.create(email_account.provider)
-            auth_data = auth_data_strategy.load_auth_data(session, email_account_uuid)
-
-            if auth_data is None:
-                return {
-                    "status": "error",
-                    "message": f"No auth data found for EmailAccount {email_account_id}",
-                }
-
-            # Check if access token exists
-            if not auth_data.access_token:
-                return {
-                    "status": "error",
-                    "message": f"Access token not available. Please re-authenticate {email_account.provider}.",
-                }
+            if cached_token is not None:
+                access_token, user_identifier = cached_token
+            else:
+                # Use auth data strategy to read provider-specific auth data
+                auth_data_strategy = AuthDataStrategyFactory.create(
+                    email_account.provider
+                )
 
-            # Get provider-specific user identifier using the strategy
-            user_identifier = auth_data_strategy.get_user_identifier(auth_data)
-            if not user_identifier:
-                return {
-                    "status": "error",
-                    "message": "User identifier not found in auth data",
-                }
+                if auth_data is None:
+                    return {
+                        "status": "error",
+                        "message": f"No auth data found for EmailAccount {email_account_id}",
+                    }
+
+                # Check if access token exists
+                if not auth_data.access_token:
+                    return {
+                        "status": "error",
+                        "message": f"Access token not available. Please re-authenticate {email_account.provider}.",
+                    }
+
+                # Get provider-specific user identifier using the strategy
+                user_identifier = auth_data_strategy.get_user_identifier(auth_data)
+                if not user_identifier:
+                    return {
+                        "status": "error",
+                        "message": "User identifier not found in auth data",
+                    }
+                access_token = auth_data.access_token
+                put_access_token(
+                    email_account_uuid,
+                    access_token,
+                    user_identifier,
+                    auth_data.expires_at,
+                )
 
             # Create email provider strategy for fetching messages
             strategy = EmailProviderStrategyFactory.create(email_account.provider)
 
-            total = 0
-            inbox_count = 0
-            retained_inbox_count = 0
-            sent_count = 0
-            # Iterate over messages in batches of 500 (AsyncGenerator)
-            async for msg_ids in strategy.list_messages(
-                access_token=auth_data.access_token,
-                user_identifier=user_identifier,
-                include_spam_trash=False,
-                label_ids=["INBOX"],
-                q="category:primary -category:promotions -category:social -category:updates",
-            ):
-                # Fetch full message data
-                messages = await strategy.fetch_messages_by_ids(
-                    msg_ids,
-                    access_token=auth_data.access_token,
+            last_flush_ts = time.monotonic()
+            last_flush_total = 0
+
+            def maybe_flush_progress() -> None:
+                nonlocal last_flush_ts, last_flush_total
+                now = time.monotonic()
+                total = counts["total"]
+                if (
+                    now - last_flush_ts < PROGRESS_FLUSH_INTERVAL_SECONDS
+                    and total - last_flush_total < PROGRESS_FLUSH_MESSAGES
+                ):
+                    return
+                job_service.update_progress(job_uuid, total)
+                last_flush_ts, last_flush_total = now, total
+
+            async def ingest_label(label: str, q: str) -> None:
+                # Listing the next page of 500 IDs overlaps with fetching
+                # metadata for earlier pages (bounded producer/consumer queue).
+                async for messages in strategy.stream_messages(
+                    access_token=access_token,
                     user_identifier=user_identifier,
                     format="metadata",
-                )
-                inbox_count += len(messages)
-                kept = []
-                for m in messages:
-                    decision = should_keep_email_metadata(m)
-                    if decision.keep:
+                    include_spam_trash=False,
+                    label_ids=[label],
+                    q=q,
+                ):
+                    kept = []
+                    for m in messages:
+                        # Sent mail is always kept; inbox mail is filtered.
+                        if label == "INBOX":
+                            decision = should_keep_email_metadata(m)
+                            if not decision.keep:
+                                print(f"{decision.reason} dropping {m['snippet']}")
+                                continue
                         _attach_context(
                             m,
                             user_id=email_account.user_id,
                             email_account_id=email_account.id,
                         )
                         kept.append(m)
+                    if label == "INBOX":
+                        print(f"Retained {len(kept)} messages in this batch")
+                        counts["inbox"] += len(messages)
+                        counts["retained_inbox"] += len(kept)
                     else:
-                        print(f"{decision.reason} dropping {m['snippet']}")
-                print(f"Retained {len(kept)} messages in this batch")
-                total += len(messages)
-                retained_inbox_count += len(kept)
-                email_ingestion_service.batch_upsert_email_metadata(data=kept)
-                job_service.update_job(job_id, progress_current=total)
-
-            async for msg_ids in strategy.list_messages(
-                access_token=auth_data.access_token,
-                user_identifier=user_identifier,
-                include_spam_trash=False,
-                label_ids=["SENT"],
-                q="-from:(noreply@ OR no-reply@ OR do-not-reply@ OR notifications@)",
-            ):
-                # Fetch full message data
-                messages = await strategy.fetch_messages_by_ids(
-                    msg_ids,
-                    access_token=auth_data.access_token,
-                    user_identifier=user_identifier,
-                    format="metadata",
-                )
-                for m in messages:
-                    _attach_context(
-                        m,
-                        user_id=email_account.user_id,
-                        email_account_id=email_account.id,
-                    )
-                sent_count += len(messages)
-                job_service.update_job(job_id, progress_current=total)
-                total += len(messages)
-                email_ingestion_service.batch_upsert_email_metadata(data=messages)
+                        counts["sent"] += len(messages)
+                    # Both labels run on this event loop and the DB calls below
+                    # don't await, so the shared counters and session are only
+                    # ever touched by one coroutine at a time.
+                    counts["total"] += len(messages)
+                    email_ingestion_service.batch_upsert_email_metadata(data=kept)
+                    maybe_flush_progress()
+
+            # Labels are independent: page through them concurrently over the
+            # strategy's shared HTTP/2 connection pool.
+            label_tasks = [
+                asyncio.create_task(ingest_label(label, q))
+                for label, q in METADATA_SYNC_LABEL_QUERIES
+            ]
+            try:
+                await asyncio.gather(*label_tasks)
+            except BaseException:
+                # Stop the other labels before the failure path rolls back and
+                # reuses the session, so none of them can write to it again.
+                for task in label_tasks:
+                    task.cancel()
+                await asyncio.gather(*label_tasks, return_exceptions=True)
+                raise
+            total = counts["total"]
 
             job_service.update_job(
-                job_id,
+                job_uuid,
                 status=JobStatus.SUCCEEDED,
                 completed_at=datetime.now(timezone.utc),
+                progress_current=total,
                 progress_total=total,
             )
             print(
-                f"inbox_count: {inbox_count}, retained_inbox_count: {retained_inbox_count}, sent_count: {sent_count}"
+                f"inbox_count: {counts['inbox']}, retained_inbox_count: {counts['retained_inbox']}, sent_count: {counts['sent']}"
             )
             return {"status": "success", "message_count": total}
 
-    except Exception as e:
-        with celery_session() as session:
-            job_repo = JobRepository(session=session)
-            job_service = JobService(job_repo)
+        except Exception as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 401:
+                # Token was revoked or rotated: make the next run reload it.
+                invalidate_access_token(email_account_uuid)
+            # Discard any half-done transaction before recording the failure.
+            session.rollback()
             job_service.update_job(
-                job_id=job_id, status=JobStatus.FAILED, error_message=str(e)
+                job_id=job_uuid,
+                status=JobStatus.FAILED,
+                error_message=str(e),
+                progress_current=counts["total"],
             )
-        return {"status": "error", "message": str(e)}
-    finally:
-        if strategy:
-            await strategy.close()
+            return {"status": "error", "message": str(e)}
+        finally:
+            if strategy:
+                await strategy.close()
 
 
 @app.task(name="thread_expansion")
@@ -222,26 +278,27 @@ def expand_emails_per_thread(job_id: str, email_account_id: str):
 
 
 async def _expand_emails_per_thread(*, job_id: str, email_account_id: str):
+    job_uuid = uuid.UUID(job_id)
+    email_account_uuid = uuid.UUID(email_account_id)
     strategy = None
-    try:
-        with celery_session() as session:
+    with celery_session() as session:
+        job_repository: JobRepository = JobRepository(session)
+        job_service: JobService = JobService(job_repository=job_repository)
+        try:
             email_repository: EmailRepository = EmailRepository(session=session)
             email_ingestion_service = EmailIngestionService(
                 email_repository=email_repository
             )
-            job_repository: JobRepository = JobRepository(session)
-            job_service: JobService = JobService(job_repository=job_repository)
 
             # Mark job as running in THREAD_EXPANSION phase
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.RUNNING,
                 phase=JobPhase.THREAD_EXPANSION,
             )
 
             # Load email account
             email_account_repo = EmailAccountRepository(session=session)
-            email_account_uuid = uuid.UUID(email_account_id)
             email_account: EmailAccount | None = email_account_repo.find_by_id(
                 email_account_uuid
             )
@@ -321,12 +378,12 @@ async def _expand_emails_per_thread(*, job_id: str, email_account_id: str):
                 email_ingestion_service.batch_upsert_email_metadata(data=kept)
                 total_messages += len(messages)
 
-                job_service.update_job(job_id, progress_current=total_messages)
+                job_service.update_job(job_uuid, progress_current=total_messages)
 
                 offset += len(thread_ids)
 
             job_service.update_job(
-                job_id,
+                job_uuid,
                 status=JobStatus.SUCCEEDED,
                 completed_at=datetime.now(timezone.utc),
                 progress_total=total_messages,
@@ -337,18 +394,17 @@ async def _expand_emails_per_thread(*, job_id: str, email_account_id: str):
                 "message_count": total_messages,
             }
 
-    except Exception as ex:
-        with celery_session() as session:
-            job_repo = JobRepository(session=session)
-            job_service = JobService(job_repo)
+        except Exception as ex:
+            # Discard any half-done transaction before recording the failure.
+            session.rollback()
             job_service.update_job(
-                job_id=job_id, status=JobStatus.FAILED, error_message=str(ex)
+                job_id=job_uuid, status=JobStatus.FAILED, error_message=str(ex)
             )
-        return {"status": "error", "message": str(ex)}
+            return {"status": "error", "message": str(ex)}
 
-    finally:
-        if strategy:
-            await strategy.close()
+        finally:
+            if strategy:
+                await strategy.close()
 
 
 @app.task(name="fetch_email_content")
@@ -364,9 +420,13 @@ async def _fetch_email_content(job_id: str, email_account_id: str) -> None:
     - Use BeautifulSoup / Go though the individual mime parts in payload and normalize text.
     - Store in DB
     """
+    job_uuid = uuid.UUID(job_id)
+    email_account_uuid = uuid.UUID(email_account_id)
     strategy = None
-    try:
-        with celery_session() as session:
+    with celery_session() as session:
+        job_repository: JobRepository = JobRepository(session)
+        job_service: JobService = JobService(job_repository=job_repository)
+        try:
             email_repository: EmailRepository = EmailRepository(session=session)
             email_content_repository: EmailContentRepository = EmailContentRepository(
                 session=session
@@ -376,19 +436,16 @@ async def _fetch_email_content(job_id: str, email_account_id: str) -> None:
                 email_repository=email_repository,
                 email_content_repository=email_content_repository,
             )
-            job_repository: JobRepository = JobRepository(session)
-            job_service: JobService = JobService(job_repository=job_repository)
 
             # Mark job as running in CONTENT_FETCH phase
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.RUNNING,
                 phase=JobPhase.CONTENT_FETCH,
             )
 
             # Load email account
             email_account_repo = EmailAccountRepository(session=session)
-            email_account_uuid = uuid.UUID(email_account_id)
             email_account: EmailAccount | None = email_account_repo.find_by_id(
                 email_account_uuid
             )
@@ -476,12 +533,12 @@ async def _fetch_email_content(job_id: str, email_account_id: str) -> None:
                 email_ingestion_service.batch_upsert_email_content(data=parsed_emails)
                 processed += len(messages)
 
-                job_service.update_job(job_id, progress_current=processed)
+                job_service.update_job(job_uuid, progress_current=processed)
 
                 offset += len(emails_batch)
 
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.SUCCEEDED,
                 completed_at=datetime.now(timezone.utc),
                 progress_total=processed,
@@ -492,18 +549,17 @@ async def _fetch_email_content(job_id: str, email_account_id: str) -> None:
                 "message_count": processed,
             }
 
-    except Exception as ex:
-        with celery_session() as session:
-            job_repo = JobRepository(session=session)
-            job_service = JobService(job_repo)
+        except Exception as ex:
+            # Discard any half-done transaction before recording the failure.
+            session.rollback()
             job_service.update_job(
-                job_id=job_id, status=JobStatus.FAILED, error_message=str(ex)
+                job_id=job_uuid, status=JobStatus.FAILED, error_message=str(ex)
             )
-        return {"status": "error", "message": str(ex)}
+            return {"status": "error", "message": str(ex)}
 
-    finally:
-        if strategy:
-            await strategy.close()
+        finally:
+            if strategy:
+                await strategy.close()
 
 
 @app.task(name="prepare_email_chunks")
@@ -520,14 +576,14 @@ def prepare_email_chunks(
 async def _prepare_email_chunks(
     job_id: str, email_account_id: str, filter_thread_ids: List[str] | None = None
 ):
-    try:
-        with celery_session() as session:
-            job_repository: JobRepository = JobRepository(session)
-            job_service: JobService = JobService(job_repository=job_repository)
-
+    job_uuid = uuid.UUID(job_id)
+    with celery_session() as session:
+        job_repository: JobRepository = JobRepository(session)
+        job_service: JobService = JobService(job_repository=job_repository)
+        try:
             # Mark job as running in CONTENT_FETCH phase
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.RUNNING,
                 phase=JobPhase.PREPARE_EMBEDDABLE_CHUNKS,
             )
@@ -578,17 +634,16 @@ async def _prepare_email_chunks(
                 processed += len(current_batch)
 
             job_service.update_job(
-                job_id=job_id,
+                job_id=job_uuid,
                 status=JobStatus.SUCCEEDED,
                 completed_at=datetime.now(timezone.utc),
                 progress_total=processed,
             )
 
-    except Exception as ex:
-        with celery_session() as session:
-            job_repo = JobRepository(session=session)
-            job_service = JobService(job_repo)
+        except Exception as ex:
+            # Discard any half-done transaction before recording the failure.
+            session.rollback()
             job_service.update_job(
-                job_id=job_id, status=JobStatus.FAILED, error_message=str(ex)
+                job_id=job_uuid, status=JobStatus.FAILED, error_message=str(ex)
             )
             return {"status": "error", "message": str(ex)}
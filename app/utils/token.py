@@ -0,0 +1,40 @@
+"""Batched CSPRNG token generation."""
+
+import base64
+import os
+import threading
+
+# Refill size for the entropy buffer; 4 KiB serves 128 default-sized tokens.
+_REFILL_SIZE = 4096
+
+_buf = b""
+_pos = 0
+_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # A forked child inherits the parent's unread buffer; without this, every
+    # child (e.g. preloaded gunicorn workers) would hand out the same tokens.
+    # The lock is replaced too, since another thread may have held it mid-fork.
+    global _buf, _pos, _lock
+    _buf, _pos, _lock = b"", 0, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def token_urlsafe(nbytes: int = 32) -> str:
+    """
+    Drop-in for `secrets.token_urlsafe` that draws from a buffered `os.urandom`
+    read instead of issuing a getrandom syscall per call.
+
+    Each byte of the buffer is handed out exactly once.
+    """
+    global _buf, _pos
+    with _lock:
+        if _pos + nbytes > len(_buf):
+            _buf = os.urandom(max(_REFILL_SIZE, nbytes))
+            _pos = 0
+        raw = _buf[_pos : _pos + nbytes]
+        _pos += nbytes
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
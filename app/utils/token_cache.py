@@ -0,0 +1,57 @@
+"""Per-process cache of provider access tokens, keyed by EmailAccount ID."""
+
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from cachetools import TLRUCache
+
+# Cached tokens are dropped this long before they actually expire, so a task
+# never starts with a token that lapses mid-sync.
+EXPIRY_BUFFER_SECONDS = 300
+
+# Values are (access_token, user_identifier, ttl_seconds); the TTL is fixed
+# when the entry is stored.
+_cache = TLRUCache(maxsize=4096, ttu=lambda _key, value, now: now + value[2])
+_lock = threading.Lock()
+
+
+def get_access_token(email_account_id: uuid.UUID) -> tuple[str, str] | None:
+    """
+    Return the cached (access_token, user_identifier) for an EmailAccount.
+
+    Returns:
+        The cached pair, or None if absent or within the expiry buffer
+    """
+    with _lock:
+        cached = _cache.get(email_account_id)
+    if cached is None:
+        return None
+    return cached[0], cached[1]
+
+
+def put_access_token(
+    email_account_id: uuid.UUID,
+    access_token: str,
+    user_identifier: str,
+    expires_at: datetime | None,
+) -> None:
+    """
+    Cache an access token until `EXPIRY_BUFFER_SECONDS` before `expires_at`.
+
+    Tokens without a known expiry, or already inside the buffer, are not cached.
+    """
+    if expires_at is None:
+        return
+    ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    ttl -= EXPIRY_BUFFER_SECONDS
+    if ttl <= 0:
+        return
+    with _lock:
+        _cache[email_account_id] = (access_token, user_identifier, ttl)
+
+
+def invalidate_access_token(email_account_id: uuid.UUID) -> None:
+    """Drop the cached access token for an EmailAccount."""
+    with _lock:
+        _cache.pop(email_account_id, None)